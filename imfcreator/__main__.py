@@ -11,7 +11,7 @@ from watchdog.events import PatternMatchingEventHandler
 from watchdog.observers import Observer
 import imfcreator.instruments as instruments
 import imfcreator.resources as resources
-from imfcreator.plugins import AdlibSongFile, MidiSongFile, InstrumentFile, load_plugins, FileTypeInfo
+from imfcreator.plugins import AdlibSongFile, MidiSongFile, InstrumentFile, FileTypeInfo
 from imfcreator.player import AdlibPlayer, PlayerState
 
 try:
@@ -29,7 +29,6 @@ except ImportError:
     import tkinter.messagebox as messagebox
 
 __version__ = 0.2
-load_plugins()
 _ADLIB_FILETYPES = AdlibSongFile.get_filetypes()
 _MIDI_FILETYPES = MidiSongFile.get_filetypes()
 _INSTRUMENT_FILETYPES = InstrumentFile.get_filetypes()
@@ -10,6 +10,7 @@ Bank numbers should be MSB << 7 + LSB since the MSB and LSB values are limited t
 Use `get_name` to get the instrument name
 """
 import logging as _logging
+import os as _os
 import typing as _typing
 from imfcreator.adlib import AdlibInstrument as _AdlibInstrument
 from imfcreator.plugins import InstrumentId, InstrumentType, InstrumentFile as _InstrumentFile, \
@@ -56,9 +57,14 @@ def update(instruments: _typing.Dict[InstrumentId, _AdlibInstrument], bank_offse
 def add_file(f, bank_offset: int = 0):
     """Adds all of the instruments in a file.
 
-    :param f: A filename or file object.
+    :param f: A filename, path-like object, or file object.
     :param bank_offset: Offset by which instrument banks are adjusted.
     """
+    if isinstance(f, (str, _os.PathLike)):
+        # Open the file once for both the instrument file and song file checks.
+        with open(f, "rb") as fp:
+            add_file(fp, bank_offset)
+        return
     try:
         instrument_file = _InstrumentFile.load_file(f)
     except ValueError:
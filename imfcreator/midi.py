@@ -29,6 +29,7 @@ class SongEvent:
 
     The data dictionary will vary per event_type.  See EventType.
     """
+    __slots__ = ("index", "track", "time", "type", "data", "channel")
 
     def __init__(self, index: int, track: int, time: float, event_type: "EventType", data: dict = None,
                  channel: int = None):
@@ -42,7 +43,7 @@ class SongEvent:
         :param channel: The event channel.  Must be None for sysex and meta event types and an integer for all others.
         """
         # Validate arguments.
-        if event_type in [EventType.F0_SYSEX, EventType.F7_SYSEX, EventType.META]:
+        if event_type in _CHANNELLESS_EVENT_TYPES:
             if channel is not None:
                 raise ValueError(f"Channel must be None for {str(event_type)} events.")
         elif channel is None or type(channel) is not int:
@@ -110,27 +111,14 @@ class SongEvent:
             return False
         return True
 
+    def sort_key(self) -> tuple:
+        """Returns the key that orders song events.  The comparison operators compare these keys."""
+        # Non-channel events sort before channel events.
+        return (self.time, _get_event_type_order(self), -1 if self.channel is None else self.channel,
+                self.track, self.index)
+
     def __lt__(self, other: "SongEvent"):
-        if self.time < other.time:
-            return True
-        elif self.time > other.time:
-            return False
-        if _get_event_type_order(self) < _get_event_type_order(other):
-            return True
-        elif _get_event_type_order(self) > _get_event_type_order(other):
-            return False
-        # Non-channel events are "less than" channel events.
-        self_channel = -1 if self.channel is None else self.channel
-        other_channel = -1 if other.channel is None else other.channel
-        if self_channel < other_channel:
-            return True
-        elif self_channel > other_channel:
-            return False
-        if self.track < other.track:
-            return True
-        elif self.track > other.track:
-            return False
-        return self.index < other.index
+        return self.sort_key() < other.sort_key()
 
 
 class EventType(IntEnum):
@@ -163,6 +151,10 @@ class EventType(IntEnum):
         return self._name_
 
 
+# Event types that do not have a channel.
+_CHANNELLESS_EVENT_TYPES = frozenset([EventType.F0_SYSEX, EventType.F7_SYSEX, EventType.META])
+
+
 class MetaType(IntEnum):
     """Song meta event types.
     Not all meta types are used by the conversion process.
@@ -210,6 +202,19 @@ class MetaType(IntEnum):
         return self._name_
 
 
+# Meta types whose data is a "text" entry.
+META_TEXT_TYPES = frozenset([
+    MetaType.TEXT_EVENT,
+    MetaType.COPYRIGHT,
+    MetaType.TRACK_NAME,
+    MetaType.INSTRUMENT_NAME,
+    MetaType.LYRIC,
+    MetaType.MARKER,
+    MetaType.CUE_POINT,
+    MetaType.PROGRAM_NAME,
+    MetaType.DEVICE_NAME,
+])
+
 _EVENT_TYPE_ORDER = {
     EventType.NOTE_OFF: 10,
     EventType.NOTE_ON: 100,
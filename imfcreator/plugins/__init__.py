@@ -8,55 +8,156 @@ from imfcreator.adlib import AdlibInstrument as _AdlibInstrument
 
 
 _PLUGIN_TYPES = []  # List of plugin type classes.
+_PLUGIN_TYPE_SET = set()  # Set of plugin type classes for lookups while registering plugins.
+_plugins_loaded = False  # Plugin modules are imported on first use unless load_plugins is called.
+_discovered_plugins = None  # type: _typing.Optional[_typing.List[str]]  # Plugin module names found in this folder.
 
 
 def _plugin_type(cls):
     """Plugin type decorator.  Registers a class as a plugin type.
 
     This adds a _PLUGINS list to the class definition.   As plugins are registered, they are added to this list.
+    Plugins are also indexed by their `_MAGIC4` signature so that `load_file` only tries likely candidates
+    and by their file type extensions so that plugins matching the file's extension are tried first.
     """
-    _logging.debug(f"Registering plugin type: {cls.__name__}")
+    _logging.debug("Registering plugin type: %s", cls.__name__)
     cls._PLUGINS = []
+    cls._MAGIC_DISPATCH = {}  # type: _typing.Dict[bytes, _typing.List[type]]
+    cls._MAGIC_UNKNOWN = []  # type: _typing.List[type]
+    cls._EXT_INDEX = {}  # type: _typing.Dict[str, _typing.List[type]]
     _PLUGIN_TYPES.append(cls)
+    _PLUGIN_TYPE_SET.add(cls)
     return cls
 
 
+def _validate_name(n: str):
+    """Raises a ValueError if the given filetype or setting name is not alphanumeric."""
+    if n.isalnum():
+        return
+    invalid_chars = [c for c in n if not c.isalnum()]
+    raise ValueError(f"Text must be alphanumeric only.  Invalid characters: {invalid_chars}")
+
+
+def _normalize_extension(ext: str) -> str:
+    """Returns the extension with a leading period."""
+    return ext if ext.startswith(".") else f".{ext}"
+
+
+def _order_candidates(plugin_type, preview: bytes, filename: str) -> list:
+    """Returns the plugins of the given type that might open the file, in the order they should be tried.
+
+    Only plugins with a matching signature and those without one are returned.  Plugins that handle the file's
+    extension come first.
+    """
+    # noinspection PyProtectedMember
+    candidates = plugin_type._MAGIC_DISPATCH.get(preview[0:4], []) + plugin_type._MAGIC_UNKNOWN
+    # noinspection PyProtectedMember
+    ext_plugins = plugin_type._EXT_INDEX.get(_os.path.splitext(filename)[1].lower())
+    if ext_plugins:
+        candidates = [c for c in candidates if c in ext_plugins] + [c for c in candidates if c not in ext_plugins]
+    return candidates
+
+
+def _read_preview(fp: _typing.Optional[_typing.IO], filename: str) -> bytes:
+    """Returns the first 32 bytes of a file.
+
+    When `fp` is None, the preview is read from `filename` without creating a buffered file object.
+    """
+    if fp is None:
+        fd = _os.open(filename, _os.O_RDONLY | getattr(_os, "O_BINARY", 0))
+        try:
+            return _os.read(fd, 32)
+        finally:
+            _os.close(fd)
+    fp.seek(0)
+    return fp.read(32)
+
+
+def _load_via_plugins(plugin_type, f):
+    """Checks the plugin classes of a plugin type for one that can load the given file.  If one is found, the file is
+    loaded and the plugin instance is returned.
+
+    :param plugin_type: The plugin type whose plugins should be checked.
+    :param f: A filename, path-like object, or a file object opened with "rb" mode.  File objects are not closed.
+    :exception ValueError: When no plugin could load the file.
+    """
+    _ensure_plugins_loaded()
+    if isinstance(f, (str, _os.PathLike)):
+        filename = _os.fspath(f)
+        fp = None  # Opened once a plugin accepts the file.
+        exclusive_fp = True
+    else:
+        fp = f  # type: _typing.IO
+        filename = fp.name
+        exclusive_fp = False
+    try:
+        # Scan plugin classes for one that can open the file.
+        _logging.info(f'Loading "{filename}".')
+        preview = _read_preview(fp, filename)
+        for subclass in _order_candidates(plugin_type, preview, filename):
+            # _logging.debug(f'Testing accept for "{filename}" using {subclass.__name__}.')
+            if subclass.accept(preview, filename):
+                if fp is None:
+                    fp = open(filename, "rb")
+                try:
+                    # _logging.debug(f'Attempting to load "{filename}" using {subclass.__name__}.')
+                    # Reset the file position for each attempt.
+                    fp.seek(0)
+                    instance = subclass(fp, filename)
+                    _logging.info(f'Loaded "{filename}" using {subclass.__name__}.')
+                    return instance
+                except (ValueError, IOError, OSError) as ex:
+                    _logging.error(f'Error while loading "{filename}" using {subclass.__name__}: {ex}')
+    finally:
+        if exclusive_fp and fp is not None:
+            fp.close()
+    raise ValueError(f'Failed to load "{filename}" as {plugin_type.__name__}.')
+
+
 def plugin(cls):
     """Plugin decorator.  Registers a class as a plugin."""
-    _logging.debug(f"Registering plugin: {cls.__name__}")
-    plugin_type = next((c for c in _PLUGIN_TYPES if issubclass(cls, c)), None)
+    _logging.debug("Registering plugin: %s", cls.__name__)
+    plugin_type = next((base for base in cls.__mro__ if base in _PLUGIN_TYPE_SET), None)
     if plugin_type:
         # noinspection PyProtectedMember
         plugin_type._PLUGINS.append(cls)
+        magic = getattr(cls, "_MAGIC4", None)
+        if magic:
+            # noinspection PyProtectedMember
+            plugin_type._MAGIC_DISPATCH.setdefault(magic[0:4], []).append(cls)
+        else:
+            # noinspection PyProtectedMember
+            plugin_type._MAGIC_UNKNOWN.append(cls)
         # register_plugin = getattr(cls, "_register_plugin", None)
         # if callable(register_plugin):
         #     register_plugin()
 
-        def validate_name(n):
-            invalid_chars = [c for c in n if not c.isalnum()]
-            if invalid_chars:
-                raise ValueError(f"Text must be alphanumeric only.  Invalid characters: {invalid_chars}")
-
         # Process _filetypes
         for filetype in cls._get_filetypes():
             # filetypes can only be alphanumeric.
-            validate_name(filetype.name)
+            _validate_name(filetype.name)
             # filetypes must be unique across all plugins
             # noinspection PyProtectedMember
-            current_filetype_class = next((c.cls for c in plugin_type._FILETYPES if c.info.name == filetype), None)
-            if current_filetype_class:
+            current_entry = plugin_type._FILETYPES.get(filetype.name)
+            if current_entry:
                 raise ValueError(f"A plugin for filetype {filetype.name} already exists.  "
-                                 f"Existing: {current_filetype_class.__name__}, "
+                                 f"Existing: {current_entry.cls.__name__}, "
                                  f"Current: {cls.__name__}")
-            _logging.debug(f"Registering filetype: {filetype.name} -> {cls.__name__}")
-            # noinspection PyProtectedMember
-            plugin_type._FILETYPES.append(_FileTypeEntry(cls, filetype))
-            if getattr(cls, "_get_filetype_settings", None):
+            _logging.debug("Registering filetype: %s -> %s", filetype.name, cls.__name__)
+            settings = None
+            if cls._get_filetype_settings is not None:
                 settings = cls._get_filetype_settings(filetype.name)
                 if settings:
                     # Validate setting names.
                     for setting in settings:
-                        validate_name(setting.name)
+                        _validate_name(setting.name)
+            entry = _FileTypeEntry(cls, filetype, settings or [], _normalize_extension(filetype.default_extension))
+            # noinspection PyProtectedMember
+            plugin_type._FILETYPES[filetype.name] = entry
+            # noinspection PyProtectedMember
+            ext_plugins = plugin_type._EXT_INDEX.setdefault(entry.extension.lower(), [])
+            if cls not in ext_plugins:
+                ext_plugins.append(cls)
         return cls
     raise ValueError(f"Unrecognized plugin type.  Valid types: {_PLUGIN_TYPES}")
 
@@ -104,7 +205,9 @@ class FileTypeSetting(_typing.NamedTuple):
 class InstrumentFile:
     """The base class for instrument file types."""
 
-    _FILETYPES = []  # type: _typing.List[_FileTypeEntry]
+    _FILETYPES = {}  # type: _typing.Dict[str, _FileTypeEntry]
+    _MAGIC4 = None  # type: _typing.Optional[bytes]  # The first 4 bytes of a readable file, when fixed.
+    _get_filetype_settings = None  # Instrument file types have no settings.
 
     def __init__(self, fp, file: str):
         self.instruments = {}  # type: _typing.Dict[InstrumentId, _AdlibInstrument]
@@ -140,40 +243,16 @@ class InstrumentFile:
 
     @classmethod
     def load_file(cls, f) -> "InstrumentFile":
-        """Checks plugin classes for one that can load the given file.  If one is found, the file is loaded."""
+        """Checks plugin classes for one that can load the given file.  If one is found, the file is loaded.
 
-        if type(f) is str:
-            filename = f
-            fp = open(filename, "rb")
-            exclusive_fp = True
-        else:
-            fp = f  # type: _typing.IO
-            filename = fp.name
-            exclusive_fp = False
-        try:
-            # Scan plugin classes for one that can open the file.
-            _logging.info(f'Loading "{filename}".')
-            preview = fp.read(32)
-            for subclass in cls._PLUGINS:  # type: _typing.Type[InstrumentFile]
-                # _logging.debug(f'Testing accept for "{filename}" using {subclass.__name__}.')
-                if subclass.accept(preview, filename):
-                    try:
-                        # _logging.debug(f'Attempting to load "{filename}" using {subclass.__name__}.')
-                        # Reset the file position for each attempt.
-                        fp.seek(0)
-                        instance = subclass(fp, filename)
-                        _logging.info(f'Loaded "{filename}" using {subclass.__name__}.')
-                        return instance
-                    except (ValueError, IOError, OSError) as ex:
-                        _logging.error(f'Error while loading "{filename}" using {subclass.__name__}: {ex}')
-        finally:
-            if exclusive_fp:
-                fp.close()
-        raise ValueError(f'Failed to load "{filename}" as {cls.__name__}.')
+        :param f: A filename, path-like object, or a file object opened with "rb" mode.  File objects are not closed.
+        """
+        return _load_via_plugins(cls, f)
 
     @classmethod
     def get_filetypes(cls) -> _typing.List["FileTypeInfo"]:
-        return [c.info for c in cls._FILETYPES]
+        _ensure_plugins_loaded()
+        return [c.info for c in cls._FILETYPES.values()]
 
 
 @_plugin_type
@@ -183,7 +262,9 @@ class MidiSongFile:
     Implementing classes should populate `self.events` during `_load_file`.
     """
 
-    _FILETYPES = []  # type: _typing.List[_FileTypeEntry]
+    _FILETYPES = {}  # type: _typing.Dict[str, _FileTypeEntry]
+    _MAGIC4 = None  # type: _typing.Optional[bytes]  # The first 4 bytes of a readable file, when fixed.
+    _get_filetype_settings = None  # Song file types have no settings.
     PERCUSSION_CHANNEL = 9
     DEFAULT_PITCH_BEND_SCALE = 2.0
 
@@ -240,39 +321,29 @@ INSTRUMENTS:
 
     def sort(self):
         """Sorts the song events into chronological order.  Also reassigns event indices."""
-        self.events = sorted([_ for _ in self.events])  # type: _typing.List[_midi.SongEvent]
-        for index in range(len(self.events)):
-            self.events[index].index = index
+        self.events.sort(key=_midi.SongEvent.sort_key)
+        for index, event in enumerate(self.events):
+            event.index = index
 
     @classmethod
-    def load_file(cls, filename: str) -> "MidiSongFile":
-        """Checks plugin classes for one that can load the given file.  If one is found, the file is loaded."""
-        with open(filename, "rb") as fp:
-            # Scan plugin classes for one that can open the file.
-            preview = fp.read(32)
-            _logging.info(f'Loading "{filename}".')
-            for subclass in cls._PLUGINS:  # type: _typing.Type[MidiSongFile]
-                # _logging.debug(f'Testing accept for "{filename}" using {subclass.__name__}.')
-                if subclass.accept(preview, filename):
-                    try:
-                        # _logging.debug(f'Attempting to load "{filename}" using {subclass.__name__}.')
-                        # Reset the file position for each attempt.
-                        fp.seek(0)
-                        instance = subclass(fp, filename)
-                        _logging.info(f'Loaded "{filename}" using {subclass.__name__}.')
-                        return instance
-                    except (ValueError, IOError, OSError) as ex:
-                        _logging.error(f'Error while loading "{filename}" using {subclass.__name__}: {ex}')
-        raise ValueError(f'Failed to load "{filename}" as {cls.__name__}.')
+    def load_file(cls, f) -> "MidiSongFile":
+        """Checks plugin classes for one that can load the given file.  If one is found, the file is loaded.
+
+        :param f: A filename, path-like object, or a file object opened with "rb" mode.  File objects are not closed.
+        """
+        return _load_via_plugins(cls, f)
 
     @classmethod
     def get_filetypes(cls) -> _typing.List["FileTypeInfo"]:
-        return [c.info for c in cls._FILETYPES]
+        _ensure_plugins_loaded()
+        return [c.info for c in cls._FILETYPES.values()]
 
 
 class _FileTypeEntry(_typing.NamedTuple):
     cls: _typing.Type["AdlibSongFile"]
     info: FileTypeInfo
+    settings: _typing.List[FileTypeSetting]  # Cached at registration.
+    extension: str  # The default extension with a leading period.
 
 
 @_plugin_type
@@ -282,7 +353,7 @@ class AdlibSongFile:
     Interacts with the song player.
     """
 
-    _FILETYPES = []  # type: _typing.List[_FileTypeEntry]
+    _FILETYPES = {}  # type: _typing.Dict[str, _FileTypeEntry]
 
     def __init__(self, midi_song: MidiSongFile, filetype: str):
         self._default_outfile = _os.path.splitext(midi_song.file)[0]
@@ -294,11 +365,13 @@ class AdlibSongFile:
 
     @property
     def default_extension(self):
-        return next((ft.default_extension for ft in self._get_filetypes() if ft.name == self._filetype), None)
+        entry = self._get_filetype_entry(self._filetype)
+        return entry.info.default_extension if entry else None
 
     @property
     def filetype_description(self):
-        return next((ft.description for ft in self._get_filetypes() if ft.name == self._filetype), None)
+        entry = self._get_filetype_entry(self._filetype)
+        return entry.info.description if entry else None
 
     @classmethod
     def _get_filetypes(cls) -> _typing.List["FileTypeInfo"]:
@@ -382,11 +455,13 @@ class AdlibSongFile:
 
     @classmethod
     def get_filetypes(cls) -> _typing.List["FileTypeInfo"]:
-        return [c.info for c in cls._FILETYPES]
+        _ensure_plugins_loaded()
+        return [c.info for c in cls._FILETYPES.values()]
 
     @classmethod
     def _get_filetype_entry(cls, filetype) -> _typing.Optional[_typing.Type[_FileTypeEntry]]:
-        return next((entry for entry in cls._FILETYPES if entry.info.name == filetype), None)
+        _ensure_plugins_loaded()
+        return cls._FILETYPES.get(filetype)
 
     @classmethod
     def get_filetype_class(cls, filetype: str) -> _typing.Type["AdlibSongFile"]:
@@ -407,13 +482,11 @@ class AdlibSongFile:
 
     @classmethod
     def get_filetype_settings(cls, filetype) -> _typing.List["FileTypeSetting"]:
-        return cls._get_filetype_entry(filetype).cls._get_filetype_settings(filetype) or []
+        return cls._get_filetype_entry(filetype).settings
 
     @classmethod
     def get_default_extension(cls, filetype: str) -> _typing.Optional[str]:
-        entry = cls._get_filetype_entry(filetype)
-        ext = entry.info.default_extension
-        return ext if ext.startswith(".") else f".{ext}"
+        return cls._get_filetype_entry(filetype).extension
 
     # @classmethod
     # def _register_plugin(cls):
@@ -442,14 +515,35 @@ class AdlibSongFile:
     #                 validate_name(setting.name)
 
 
+def _ensure_plugins_loaded():
+    """Loads the plugin modules if they have not been loaded yet."""
+    if not _plugins_loaded:
+        load_plugins()
+
+
+def _discover_plugins() -> _typing.List[str]:
+    """Returns the names of the plugin modules in this folder.  The folder is only scanned once."""
+    global _discovered_plugins
+    if _discovered_plugins is None:
+        with _os.scandir(_os.path.dirname(__file__)) as entries:
+            _discovered_plugins = [entry.name[0:-3] for entry in entries
+                                   if entry.is_file() and entry.name.lower().endswith("fileplugin.py")]
+    return _discovered_plugins
+
+
 def load_plugins():
-    """Initializes plugins."""
-    for p in _PLUGIN_TYPES:
-        p._PLUGINS = []
-    # Load plugins.
-    dirname = _os.path.dirname(__file__)
-    plugins = [f[0:-3] for f in _os.listdir(dirname)
-               if _os.path.isfile(_os.path.join(dirname, f)) and f.lower().endswith("fileplugin.py")]
-    for p in plugins:
-        _importlib.import_module(f"{__name__}.{p}")
+    """Initializes plugins.
 
+    Calling this is optional.  Plugins are loaded automatically the first time they are needed and are only loaded once.
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True  # Set first so plugin modules using this package do not reload it while importing.
+    try:
+        for p in _discover_plugins():
+            _importlib.import_module(f"{__name__}.{p}")
+    except BaseException:
+        # Allow a later call to retry.  Modules that did import are cached and are not registered twice.
+        _plugins_loaded = False
+        raise
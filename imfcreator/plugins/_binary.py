@@ -1,73 +1,122 @@
 """Utility methods for unpacking byte data."""
-import struct as _struct
 import typing as _typing
 
 
-def u8(c):
+def _size_error(c: bytes, size: int) -> ValueError:
+    return ValueError(f"Expected {size} bytes, but got {len(c)}.")
+
+
+def u8(c: _typing.Union[bytes, int]) -> int:
     """Read an unsigned 8-bit integer."""
-    try:
-        return _struct.unpack("<B", c)[0]
-    except TypeError:
-        return _struct.unpack("<B", bytes([c]))[0]
+    if isinstance(c, int):
+        return c & 0xff
+    if len(c) != 1:
+        raise _size_error(c, 1)
+    return c[0]
 
 
-def s8(c):
+def s8(c: _typing.Union[bytes, int]) -> int:
     """Read a signed 8-bit integer."""
-    try:
-        return _struct.unpack("<b", c)[0]
-    except TypeError:
-        return _struct.unpack("<b", bytes([c]))[0]
+    if isinstance(c, int):
+        c &= 0xff
+    elif len(c) != 1:
+        raise _size_error(c, 1)
+    else:
+        c = c[0]
+    return c if c < 0x80 else c - 0x100
 
 
-def u16le(c):
+def u16le(c: bytes) -> int:
     """Read an unsigned little-endian 16-bit integer."""
-    return _struct.unpack("<H", c)[0]
+    if len(c) != 2:
+        raise _size_error(c, 2)
+    return int.from_bytes(c, "little")
 
 
-def u16be(c):
+def u16be(c: bytes) -> int:
     """Read an unsigned big-endian 16-bit integer."""
-    return _struct.unpack(">H", c)[0]
+    if len(c) != 2:
+        raise _size_error(c, 2)
+    return int.from_bytes(c, "big")
 
 
-def s16le(c):
+def s16le(c: bytes) -> int:
     """Read a signed little-endian 16-bit integer."""
-    return _struct.unpack("<h", c)[0]
+    if len(c) != 2:
+        raise _size_error(c, 2)
+    return int.from_bytes(c, "little", signed=True)
 
 
-def s16be(c):
+def s16be(c: bytes) -> int:
     """Read a signed big-endian 16-bit integer."""
-    return _struct.unpack(">h", c)[0]
+    if len(c) != 2:
+        raise _size_error(c, 2)
+    return int.from_bytes(c, "big", signed=True)
 
 
-def u32le(c):
+def u32le(c: bytes) -> int:
     """Read an unsigned little-endian 32-bit integer."""
-    return _struct.unpack("<I", c)[0]
+    if len(c) != 4:
+        raise _size_error(c, 4)
+    return int.from_bytes(c, "little")
 
 
-def u32be(c):
+def u32be(c: bytes) -> int:
     """Read an unsigned big-endian 32-bit integer."""
-    return _struct.unpack(">I", c)[0]
+    if len(c) != 4:
+        raise _size_error(c, 4)
+    return int.from_bytes(c, "big")
 
 
-def s32le(c):
+def s32le(c: bytes) -> int:
     """Read a signed little-endian 32-bit integer."""
-    return _struct.unpack("<i", c)[0]
+    if len(c) != 4:
+        raise _size_error(c, 4)
+    return int.from_bytes(c, "little", signed=True)
 
 
-def s32be(c):
+def s32be(c: bytes) -> int:
     """Read a signed big-endian 32-bit integer."""
-    return _struct.unpack(">i", c)[0]
+    if len(c) != 4:
+        raise _size_error(c, 4)
+    return int.from_bytes(c, "big", signed=True)
 
 
-def read_midi_var_length(fp: _typing.IO):
+def read_midi_var_length(fp: _typing.BinaryIO) -> int:
     """Reads a length using MIDI's variable length format."""
-    length = 0
     b = u8(fp.read(1))
+    if b < 0x80:
+        return b
+    length = 0
     while b & 0x80:
-        length = length * 0x80 + (b & 0x7f)
+        length = (length << 7) | (b & 0x7f)
         b = u8(fp.read(1))
-    return length * 0x80 + b
+    return (length << 7) | b
 
 
-def get_unicode_text(text: bytes):
-    return text.decode("unicode-escape").rstrip("x\00")
+def read_midi_var_length_buf(buf: bytes, pos: int) -> _typing.Tuple[int, int]:
+    """Reads a length using MIDI's variable length format from a buffer.
+
+    Returns a tuple of the length and the position following it.
+    """
+    b = buf[pos]
+    pos += 1
+    if b < 0x80:
+        # Most delta times fit in a single byte.
+        return b, pos
+    length = 0
+    while b & 0x80:
+        length = (length << 7) | (b & 0x7f)
+        b = buf[pos]
+        pos += 1
+    return (length << 7) | b, pos
+
+
+def get_unicode_text(text: bytes) -> str:
+    """Decodes text data, removing trailing null characters."""
+    text = text.rstrip(b"\x00")
+    if b"\\" not in text:
+        # Without escapes, unicode-escape decodes the same as latin-1.
+        return text.decode("latin-1")
+    # Escaped nulls only become null characters once decoded.
+    return text.decode("unicode-escape").rstrip("\x00")
@@ -1,7 +1,6 @@
 import logging as _logging
 import typing as _typing
 import imfcreator.midi as _midi
-from functools import wraps
 from . import InstrumentType, MidiSongFile
 import imfcreator.instruments as instruments
 from imfcreator.signal import Signal
@@ -9,26 +8,51 @@ from imfcreator.adlib import AdlibInstrument
 
 
 def calculate_msb_lsb(msb: int, lsb: int) -> int:
-    assert msb & ~0x7f == 0
-    assert lsb & ~0x7f == 0
-    return (msb << 7) + lsb
-
-
-_CONTROLLER_HANDLERS = {}
-
-
-def _controller_handler(*controllers):
+    """Combines 7-bit MSB and LSB values into a 14-bit value.  Higher bits are ignored."""
+    return ((msb & 0x7f) << 7) | (lsb & 0x7f)
+
+
+# Defined ControllerType members indexed by controller number, None for undefined controllers.
+# Undefined controllers are left to ControllerType so that it warns about them when they are used.
+# noinspection PyProtectedMember
+_CONTROLLER_TYPES = [_midi.ControllerType._value2member_map_.get(cc)
+                     for cc in range(128)]  # type: _typing.List[_typing.Optional[_midi.ControllerType]]
+# The (MSB, LSB) controller pair for each MSB and LSB controller number, None for other controllers.
+_MSB_LSB_PAIRS = [(cc % 32, cc % 32 + 32) if cc < 64 else None
+                  for cc in range(128)]  # type: _typing.List[_typing.Optional[_typing.Tuple[int, int]]]
+_MSB_LSB_PAIRS[_midi.ControllerType.NRPN_MSB] = _MSB_LSB_PAIRS[_midi.ControllerType.NRPN_LSB] = \
+    (_midi.ControllerType.NRPN_MSB, _midi.ControllerType.NRPN_LSB)
+_MSB_LSB_PAIRS[_midi.ControllerType.RPN_MSB] = _MSB_LSB_PAIRS[_midi.ControllerType.RPN_LSB] = \
+    (_midi.ControllerType.RPN_MSB, _midi.ControllerType.RPN_LSB)
+# Controller handlers indexed directly by controller number.
+_CONTROLLER_HANDLERS = [None] * 128  # type: _typing.List[_typing.Optional[_typing.Callable]]
+# Whether a controller's handler must run even when the controller value does not change.
+_CONTROLLER_HANDLER_ALWAYS_RUNS = [False] * 128  # type: _typing.List[bool]
+
+
+def _controller_handler(*controllers, always_run: bool = False):
+    """Registers a MidiChannelInfo method as the handler for the given controllers.
+
+    Handlers only need to run when the controller value changes, unless always_run is set.  Use always_run for
+    handlers that act on other channel state, such as RPN data entry.
+    """
     def _decorator(f):
-        @wraps(f)
-        def _wrapper(self, controller):
-            return f(self, controller)
-
         for cc in controllers:
-            _CONTROLLER_HANDLERS[cc] = _wrapper
-        return _wrapper
+            _CONTROLLER_HANDLERS[int(cc)] = f
+            _CONTROLLER_HANDLER_ALWAYS_RUNS[int(cc)] = always_run
+        return f
     return _decorator
 
 
+def _scaled_controller_handler(attribute: str, scale: _typing.Callable[[int], float],
+                               msb: _midi.ControllerType, lsb: _midi.ControllerType):
+    """Creates a MidiChannelInfo controller handler that stores the scaled 14-bit value of an MSB/LSB pair."""
+    @_controller_handler(msb, lsb)
+    def _handler(self, controller):
+        setattr(self, attribute, scale(self.calculate_msb_lsb(controller)))
+    return _handler
+
+
 class MidiEngine:
     """A class to process song events in chronological order.
 
@@ -50,7 +74,7 @@ class MidiEngine:
     GM_DRUM_BANK = calculate_msb_lsb(120, 0)
     XG_SFX_BANK = calculate_msb_lsb(126, 0)
     XG_DRUM_BANK = calculate_msb_lsb(127, 0)
-    _DRUM_BANKS = [GM_DRUM_BANK, XG_SFX_BANK, XG_DRUM_BANK]
+    _DRUM_BANKS = frozenset([GM_DRUM_BANK, XG_SFX_BANK, XG_DRUM_BANK])
 
     def __init__(self, song: MidiSongFile):
         song.sort()
@@ -79,9 +103,36 @@ class MidiEngine:
         self.on_key_signature = Signal(song_event=KeySignatureMetaEvent)
         self.on_sequencer_specific = Signal(song_event=SequencerSpecificMetaEvent)
         self.on_end_of_song = Signal(song_event=EndOfSongEvent)
+        # Event dispatch tables.
+        self._event_handlers = {
+            _midi.EventType.NOTE_OFF: self._handle_note_off,
+            _midi.EventType.NOTE_ON: self._handle_note_on,
+            _midi.EventType.POLYPHONIC_KEY_PRESSURE: self._handle_polyphonic_key_pressure,
+            _midi.EventType.CONTROLLER_CHANGE: self._handle_controller_change,
+            _midi.EventType.PROGRAM_CHANGE: self._handle_program_change,
+            _midi.EventType.CHANNEL_KEY_PRESSURE: self._handle_channel_key_pressure,
+            _midi.EventType.PITCH_BEND: self._handle_pitch_bend,
+            _midi.EventType.F0_SYSEX: self._handle_sysex,
+            _midi.EventType.F7_SYSEX: self._handle_sysex,
+            _midi.EventType.META: self._handle_meta,
+        }  # type: _typing.Dict[_midi.EventType, _typing.Callable[[_midi.SongEvent], None]]
+        self._meta_handlers = {
+            _midi.MetaType.SEQUENCE_NUMBER: (self.on_meta_sequence_number, SequenceNumberMetaEvent),
+            _midi.MetaType.CHANNEL_PREFIX: (self.on_meta_channel_prefix, ChannelPrefixMetaEvent),
+            _midi.MetaType.PORT: (self.on_meta_port, PortMetaEvent),
+            _midi.MetaType.END_OF_TRACK: (self.on_end_of_track, EndOfTrackMetaEvent),
+            _midi.MetaType.SET_TEMPO: (self.on_tempo_change, TempoChangeMetaEvent),
+            _midi.MetaType.SMPTE_OFFSET: (self.on_smpte_offset, SmpteOffsetMetaEvent),
+            _midi.MetaType.TIME_SIGNATURE: (self.on_time_signature, TimeSignatureMetaEvent),
+            _midi.MetaType.KEY_SIGNATURE: (self.on_key_signature, KeySignatureMetaEvent),
+            _midi.MetaType.SEQUENCER_SPECIFIC: (self.on_sequencer_specific, SequencerSpecificMetaEvent),
+        }  # type: _typing.Dict[_midi.MetaType, _typing.Tuple[Signal, type]]
+        for meta_type in _midi.META_TEXT_TYPES:
+            self._meta_handlers[meta_type] = (self.on_meta_text, TextMetaEvent)
 
     def is_percussion_channel(self, channel: int) -> bool:
-        return channel == self._song.PERCUSSION_CHANNEL or self.channels[channel].bank in MidiEngine._DRUM_BANKS
+        # noinspection PyProtectedMember
+        return channel == self._song.PERCUSSION_CHANNEL or self.channels[channel]._is_drum_bank
 
     def get_adlib_instrument(self, event) -> AdlibInstrument:
         midi_channel = self.channels[event.channel]
@@ -95,110 +146,133 @@ class MidiEngine:
 
     def start(self):
         # Start with an arbitrary default tempo in the song doesn't set it.
-        self.on_end_of_song(song_event=TempoChangeMetaEvent(time=0.0, track=0,
-                                                            type=_midi.EventType.META,
-                                                            meta_type=_midi.MetaType.SET_TEMPO,
-                                                            bpm=120.0))
+        self.on_end_of_song.emit_positional(TempoChangeMetaEvent(time=0.0, track=0,
+                                                                 type=_midi.EventType.META,
+                                                                 meta_type=_midi.MetaType.SET_TEMPO,
+                                                                 bpm=120.0))
+        # Bind to locals for the event loop.
+        on_debug_event = self.on_debug_event
+        event_handlers = self._event_handlers
         for song_event in self._song.events:
-            self.on_debug_event(song_event=song_event)
-            # Build event args.
-            event_args = {
-                "time": song_event.time,
-                "track": song_event.track,
-                "type": song_event.type,
-            }
-            if song_event.channel is not None:
-                event_args["channel"] = song_event.channel
-            event_args.update(song_event.data)
+            if on_debug_event.has_handlers:
+                on_debug_event.emit_positional(song_event)
             # Fire events
-            if song_event.type == _midi.EventType.NOTE_OFF:
-                active_note = self.channels[song_event.channel].remove_active_note(**event_args)
-                if not active_note:
-                    continue
-                event_args["instrument"] = active_note.instrument
-                self.on_note_off(song_event=NoteEvent(**event_args))
-            elif song_event.type == _midi.EventType.NOTE_ON:
-                if song_event["velocity"] == 0:
-                    # Don't display an error when removing NOTE_ON event with velocity 0.
-                    active_note = self.channels[song_event.channel].remove_active_note(show_error=False, **event_args)
-                    if not active_note:
-                        continue
-                    event_args["instrument"] = active_note.instrument
-                    self.on_note_off(song_event=NoteEvent(**event_args))
-                else:
-                    event_args["instrument"] = self.channels[song_event.channel].instrument
-                    note_event = NoteEvent(**event_args)
-                    self.channels[song_event.channel].add_active_note(note_event)
-                    self.on_note_on(song_event=note_event)
-            elif song_event.type == _midi.EventType.POLYPHONIC_KEY_PRESSURE:
-                self.on_polyphonic_key_pressure(song_event=PolyphonicKeyPressureEvent(**event_args))
-            elif song_event.type == _midi.EventType.CONTROLLER_CHANGE:
-                # PyCharm bug - https://youtrack.jetbrains.com/issue/PY-42287
-                # noinspection PyArgumentList
-                controller = _midi.ControllerType(song_event["controller"])  # type: _midi.ControllerType
-                value = song_event["value"]
-                self.channels[song_event.channel].set_controller_value(controller, value)
-                self.on_controller_change(song_event=ControllerChangeEvent(**event_args))
-            elif song_event.type == _midi.EventType.PROGRAM_CHANGE:
-                # Only trigger the signal if the value changes.
-                # Use the private member so the "no program assigned" warning doesn't fire.
-                # noinspection PyProtectedMember
-                if self.channels[song_event.channel]._instrument != song_event["program"]:
-                    self.channels[song_event.channel].instrument = song_event["program"]
-                    self.on_program_change(song_event=ProgramChangeEvent(**event_args))
-            elif song_event.type == _midi.EventType.CHANNEL_KEY_PRESSURE:
-                # Only trigger the signal if the value changes.
-                if self.channels[song_event.channel].key_pressure != song_event["pressure"]:
-                    self.channels[song_event.channel].key_pressure = song_event["pressure"]
-                    self.on_channel_key_pressure(song_event=ChannelKeyPressureEvent(**event_args))
-            elif song_event.type == _midi.EventType.PITCH_BEND:
-                # Only trigger the signal if the value changes.
-                if self.channels[song_event.channel].pitch_bend != song_event["amount"]:
-                    self.channels[song_event.channel].pitch_bend = song_event["amount"]
-                    self.on_pitch_bend(song_event=PitchBendEvent(**event_args))
-            elif song_event.type in [_midi.EventType.F0_SYSEX, _midi.EventType.F7_SYSEX]:
-                self.on_sysex(song_event=SysexEvent(**event_args))
-            elif song_event.type == _midi.EventType.META:
-                meta_type = song_event["meta_type"]
-                if meta_type == _midi.MetaType.SEQUENCE_NUMBER:
-                    self.on_meta_sequence_number(song_event=SequenceNumberMetaEvent(**event_args))
-                elif meta_type in [_midi.MetaType.TEXT_EVENT,
-                                   _midi.MetaType.COPYRIGHT,
-                                   _midi.MetaType.TRACK_NAME,
-                                   _midi.MetaType.INSTRUMENT_NAME,
-                                   _midi.MetaType.LYRIC,
-                                   _midi.MetaType.MARKER,
-                                   _midi.MetaType.CUE_POINT,
-                                   _midi.MetaType.PROGRAM_NAME,
-                                   _midi.MetaType.DEVICE_NAME]:
-                    self.on_meta_text(song_event=TextMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.CHANNEL_PREFIX:
-                    self.on_meta_channel_prefix(song_event=ChannelPrefixMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.PORT:
-                    self.on_meta_port(song_event=PortMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.END_OF_TRACK:
-                    self.on_end_of_track(song_event=EndOfTrackMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.SET_TEMPO:
-                    self.on_tempo_change(song_event=TempoChangeMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.SMPTE_OFFSET:
-                    self.on_smpte_offset(song_event=SmpteOffsetMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.TIME_SIGNATURE:
-                    self.on_time_signature(song_event=TimeSignatureMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.KEY_SIGNATURE:
-                    self.on_key_signature(song_event=KeySignatureMetaEvent(**event_args))
-                elif meta_type == _midi.MetaType.SEQUENCER_SPECIFIC:
-                    self.on_sequencer_specific(song_event=SequencerSpecificMetaEvent(**event_args))
-                else:
-                    _logging.error(f"Unexpected meta event type: {meta_type}")
-            else:
+            try:
+                handler = event_handlers[song_event.type]
+            except KeyError:
                 _logging.error(f"Unexpected MIDI event type: {song_event.type}")
-        last_event_time = max([event.time for event in self._song.events])
-        self.on_end_of_song(song_event=EndOfSongEvent(time=last_event_time))
+            else:
+                handler(song_event)
+        # Events are sorted by time, so the last one ends the song.
+        last_event_time = self._song.events[-1].time if self._song.events else 0.0
+        self.on_end_of_song.emit_positional(EndOfSongEvent(time=last_event_time))
         # Verify that there are no active notes on the MIDI channels.
         for ch in self.channels:
             if ch.active_notes:
                 _logging.warning(f"MIDI track {ch.number} ended with active notes: {ch.active_notes}")
 
+    def _handle_note_off(self, song_event: _midi.SongEvent):
+        data = song_event.data
+        active_note = self.channels[song_event.channel].remove_active_note(song_event.channel, data["note"],
+                                                                           song_event.track)
+        if not active_note:
+            return
+        if self.on_note_off.has_handlers:
+            self.on_note_off.emit_positional(NoteEvent(song_event.time, song_event.track, song_event.type,
+                                                       song_event.channel, data["note"], data["velocity"],
+                                                       active_note.instrument))
+
+    def _handle_note_on(self, song_event: _midi.SongEvent):
+        data = song_event.data
+        channel_info = self.channels[song_event.channel]
+        if data["velocity"] == 0:
+            # Don't display an error when removing NOTE_ON event with velocity 0.
+            active_note = channel_info.remove_active_note(song_event.channel, data["note"], song_event.track,
+                                                          show_error=False)
+            if not active_note:
+                return
+            if self.on_note_off.has_handlers:
+                self.on_note_off.emit_positional(NoteEvent(song_event.time, song_event.track, song_event.type,
+                                                           song_event.channel, data["note"], data["velocity"],
+                                                           active_note.instrument))
+        else:
+            note_event = NoteEvent(song_event.time, song_event.track, song_event.type, song_event.channel,
+                                   data["note"], data["velocity"], channel_info.instrument)
+            channel_info.add_active_note(note_event)
+            self.on_note_on.emit_positional(note_event)
+
+    def _handle_polyphonic_key_pressure(self, song_event: _midi.SongEvent):
+        if self.on_polyphonic_key_pressure.has_handlers:
+            data = song_event.data
+            self.on_polyphonic_key_pressure.emit_positional(
+                PolyphonicKeyPressureEvent(song_event.time, song_event.track, song_event.type, song_event.channel,
+                                           data["note"], data["pressure"]))
+
+    def _handle_controller_change(self, song_event: _midi.SongEvent):
+        data = song_event.data
+        controller = _CONTROLLER_TYPES[data["controller"]]
+        if controller is None:
+            # PyCharm bug - https://youtrack.jetbrains.com/issue/PY-42287
+            # noinspection PyArgumentList
+            controller = _midi.ControllerType(data["controller"])  # type: _midi.ControllerType
+        value = data["value"]
+        self.channels[song_event.channel].set_controller_value(controller, value)
+        if self.on_controller_change.has_handlers:
+            self.on_controller_change.emit_positional(
+                ControllerChangeEvent(song_event.time, song_event.track, song_event.type, song_event.channel,
+                                      data["controller"], value))
+
+    def _handle_program_change(self, song_event: _midi.SongEvent):
+        channel_info = self.channels[song_event.channel]
+        program = song_event.data["program"]
+        # Only trigger the signal if the value changes.
+        # Use the private member so the "no program assigned" warning doesn't fire.
+        # noinspection PyProtectedMember
+        if channel_info._instrument != program:
+            channel_info.instrument = program
+            if self.on_program_change.has_handlers:
+                self.on_program_change.emit_positional(
+                    ProgramChangeEvent(song_event.time, song_event.track, song_event.type, song_event.channel,
+                                       program))
+
+    def _handle_channel_key_pressure(self, song_event: _midi.SongEvent):
+        channel_info = self.channels[song_event.channel]
+        pressure = song_event.data["pressure"]
+        # Only trigger the signal if the value changes.
+        if channel_info.key_pressure != pressure:
+            channel_info.key_pressure = pressure
+            if self.on_channel_key_pressure.has_handlers:
+                self.on_channel_key_pressure.emit_positional(
+                    ChannelKeyPressureEvent(song_event.time, song_event.track, song_event.type, song_event.channel,
+                                            pressure))
+
+    def _handle_pitch_bend(self, song_event: _midi.SongEvent):
+        channel_info = self.channels[song_event.channel]
+        amount = song_event.data["amount"]
+        # Only trigger the signal if the value changes.
+        if channel_info.pitch_bend != amount:
+            channel_info.pitch_bend = amount
+            if self.on_pitch_bend.has_handlers:
+                self.on_pitch_bend.emit_positional(
+                    PitchBendEvent(song_event.time, song_event.track, song_event.type, song_event.channel, amount))
+
+    def _handle_sysex(self, song_event: _midi.SongEvent):
+        if self.on_sysex.has_handlers:
+            self.on_sysex.emit_positional(SysexEvent(song_event.time, song_event.track, song_event.type,
+                                                     song_event.data["data"]))
+
+    def _handle_meta(self, song_event: _midi.SongEvent):
+        meta_type = song_event.data["meta_type"]
+        try:
+            signal, event_class = self._meta_handlers[meta_type]
+        except KeyError:
+            _logging.error(f"Unexpected meta event type: {meta_type}")
+        else:
+            if signal.has_handlers:
+                # The data dictionary holds meta_type and the type-specific fields.
+                signal.emit_positional(event_class(song_event.time, song_event.track, song_event.type,
+                                                   **song_event.data))
+
 
 class MidiChannelInfo:
     # Controller info:
@@ -210,6 +284,18 @@ class MidiChannelInfo:
     TUNING_PROGRAM_SELECT_RPN = (0, 3)
     TUNING_BANK_SELECT_RPN = (0, 4)
     NULL_RPN = (127, 127)
+    # Controller values set by reset_controllers.  All others are 0.
+    _DEFAULT_CONTROLLER_VALUES = (
+        (_midi.ControllerType.VOLUME_MSB, 127),
+        (_midi.ControllerType.BALANCE_MSB, 64),  # center
+        (_midi.ControllerType.PAN_MSB, 64),  # center
+        (_midi.ControllerType.XG_BRIGHTNESS, 127),
+        (_midi.ControllerType.EXPRESSION_MSB, 127),
+        (_midi.ControllerType.RPN_MSB, 127),
+        (_midi.ControllerType.RPN_LSB, 127),
+        (_midi.ControllerType.NRPN_MSB, 127),
+        (_midi.ControllerType.NRPN_LSB, 127),
+    )
 
     def __init__(self, number, song: MidiSongFile):
         self.number = number
@@ -219,7 +305,7 @@ class MidiChannelInfo:
         self.key_pressure = 127
         self.active_notes = []  # type: _typing.List[NoteEvent]
         # Controller value cache.
-        self._controllers = [0] * 128
+        self._controllers = bytearray(128)
         self._in_rpn_data = None
         self._default_pitch_bend_msb = song.DEFAULT_PITCH_BEND_SCALE
         # http://www.philrees.co.uk/nrpnq.htm
@@ -233,6 +319,7 @@ class MidiChannelInfo:
         }
         # Calculated controller values.
         self._bank = 0
+        self._is_drum_bank = False
         self._modulation_wheel = 0.0
         self._breath_controller = 0.0
         self._foot_controller = 0.0
@@ -248,30 +335,25 @@ class MidiChannelInfo:
 
     def reset_controllers(self):
         """Sets controllers back to their defaults."""
-        # Clear all controller values.
-        for cc in range(len(self._controllers)):
-            self._controllers[cc] = 0
+        # Write all controller values at once, then update the calculated values.
+        controllers = self._controllers
+        controllers[:] = bytes(len(controllers))
+        for controller, value in MidiChannelInfo._DEFAULT_CONTROLLER_VALUES:
+            controllers[controller] = value
         self._bank = 0
+        self._is_drum_bank = False
         self._modulation_wheel = 0.0
         self._breath_controller = 0.0
         self._foot_controller = 0.0
         self._portamento_time = 0.0
-        self._volume = 0.0
-        self._balance = 0.0
-        self._pan = 0.0
-        self._expression = 0.0
+        self._set_volume(_midi.ControllerType.VOLUME_MSB)
+        self._set_balance(_midi.ControllerType.BALANCE_MSB)
+        self._set_pan(_midi.ControllerType.PAN_MSB)
+        self._set_expression(_midi.ControllerType.EXPRESSION_MSB)
+        # Both RPN and NRPN select NULL_RPN.
+        self._in_rpn_data = None
         for key in self.rpn.keys():
             self.set_rpn_value(key, 0, 0)
-        # Set controller values to defaults.
-        self.set_controller_value(_midi.ControllerType.VOLUME_MSB, 127)
-        self.set_controller_value(_midi.ControllerType.BALANCE_MSB, 64)  # center
-        self.set_controller_value(_midi.ControllerType.PAN_MSB, 64)  # center
-        self.set_controller_value(_midi.ControllerType.XG_BRIGHTNESS, 127)
-        self.set_controller_value(_midi.ControllerType.EXPRESSION_MSB, 127)
-        self.set_controller_value(_midi.ControllerType.RPN_MSB, 127)
-        self.set_controller_value(_midi.ControllerType.RPN_LSB, 127)
-        self.set_controller_value(_midi.ControllerType.NRPN_MSB, 127)
-        self.set_controller_value(_midi.ControllerType.NRPN_LSB, 127)
         self.set_rpn_value(MidiChannelInfo.PITCH_BEND_SENSITIVITY_RPN, self._default_pitch_bend_msb, 0)  # semi, cents
         self.set_rpn_value(MidiChannelInfo.FINE_TUNING_RPN, 64, 0)  # Center/A440
         self.set_rpn_value(MidiChannelInfo.COARSE_TUNING_RPN, 64, 0)  # center
@@ -284,10 +366,14 @@ class MidiChannelInfo:
         if value & ~0x7f:
             _logging.warning(f"Controller {controller} out of range: {value}")
             value &= 0x7f
+        if self._controllers[controller] == value and not _CONTROLLER_HANDLER_ALWAYS_RUNS[controller]:
+            # Calculated values are already up to date.
+            return
         self._controllers[controller] = value
         # Check controller handlers.
-        if controller in _CONTROLLER_HANDLERS:
-            _CONTROLLER_HANDLERS[controller](self, controller)
+        handler = _CONTROLLER_HANDLERS[controller]
+        if handler is not None:
+            handler(self, controller)
 
     @property
     def instrument(self) -> int:
@@ -306,109 +392,93 @@ class MidiChannelInfo:
             value -= 128
         self._instrument = value
 
-    # noinspection PyUnusedLocal
     @_controller_handler(_midi.ControllerType.BANK_SELECT_MSB, _midi.ControllerType.BANK_SELECT_LSB)
     def _set_bank(self, controller):
-        self._bank = self.calculate_msb_lsb(_midi.ControllerType.BANK_SELECT_MSB, _midi.ControllerType.BANK_SELECT_LSB)
+        self._bank = self.calculate_msb_lsb(controller)
+        self._is_drum_bank = self._bank in MidiEngine._DRUM_BANKS
 
     @property
     def bank(self) -> int:
         return self._bank
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.MODULATION_WHEEL_MSB, _midi.ControllerType.MODULATION_WHEEL_LSB)
-    def _set_modulation_wheel(self, controller):
-        self._modulation_wheel = _midi.scale_14bit(self.calculate_msb_lsb(_midi.ControllerType.MODULATION_WHEEL_MSB,
-                                                                          _midi.ControllerType.MODULATION_WHEEL_LSB))
+    _set_modulation_wheel = _scaled_controller_handler("_modulation_wheel", _midi.scale_14bit,
+                                                       _midi.ControllerType.MODULATION_WHEEL_MSB,
+                                                       _midi.ControllerType.MODULATION_WHEEL_LSB)
 
     @property
     def modulation_wheel(self) -> float:
         return self._modulation_wheel
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.BREATH_CONTROLLER_MSB, _midi.ControllerType.BREATH_CONTROLLER_LSB)
-    def _set_breath_controller(self, controller):
-        self._breath_controller = _midi.scale_14bit(self.calculate_msb_lsb(_midi.ControllerType.BREATH_CONTROLLER_MSB,
-                                                                           _midi.ControllerType.BREATH_CONTROLLER_LSB))
+    _set_breath_controller = _scaled_controller_handler("_breath_controller", _midi.scale_14bit,
+                                                        _midi.ControllerType.BREATH_CONTROLLER_MSB,
+                                                        _midi.ControllerType.BREATH_CONTROLLER_LSB)
 
     @property
     def breath_controller(self) -> float:
         return self._breath_controller
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.FOOT_CONTROLLER_MSB, _midi.ControllerType.FOOT_CONTROLLER_LSB)
-    def _set_foot_controller(self, controller):
-        self._foot_controller = _midi.scale_14bit(self.calculate_msb_lsb(_midi.ControllerType.FOOT_CONTROLLER_MSB,
-                                                                         _midi.ControllerType.FOOT_CONTROLLER_LSB))
+    _set_foot_controller = _scaled_controller_handler("_foot_controller", _midi.scale_14bit,
+                                                      _midi.ControllerType.FOOT_CONTROLLER_MSB,
+                                                      _midi.ControllerType.FOOT_CONTROLLER_LSB)
 
     @property
     def foot_controller(self) -> float:
         return self._foot_controller
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.PORTAMENTO_TIME_MSB, _midi.ControllerType.PORTAMENTO_TIME_LSB)
-    def _set_portamento_time(self, controller):
-        self._portamento_time = _midi.scale_14bit(self.calculate_msb_lsb(_midi.ControllerType.PORTAMENTO_TIME_MSB,
-                                                                         _midi.ControllerType.PORTAMENTO_TIME_LSB))
+    _set_portamento_time = _scaled_controller_handler("_portamento_time", _midi.scale_14bit,
+                                                      _midi.ControllerType.PORTAMENTO_TIME_MSB,
+                                                      _midi.ControllerType.PORTAMENTO_TIME_LSB)
 
     @property
     def portamento_time(self) -> float:
         return self._portamento_time
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.VOLUME_MSB, _midi.ControllerType.VOLUME_LSB)
-    def _set_volume(self, controller):
-        self._volume = _midi.scale_14bit(self.calculate_msb_lsb(_midi.ControllerType.VOLUME_MSB,
-                                                                _midi.ControllerType.VOLUME_LSB))
+    _set_volume = _scaled_controller_handler("_volume", _midi.scale_14bit,
+                                             _midi.ControllerType.VOLUME_MSB,
+                                             _midi.ControllerType.VOLUME_LSB)
 
     @property
     def volume(self) -> float:
         return self._volume
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.BALANCE_MSB, _midi.ControllerType.BALANCE_LSB)
-    def _set_balance(self, controller):
-        self._balance = _midi.balance_14bit(self.calculate_msb_lsb(_midi.ControllerType.BALANCE_MSB,
-                                                                   _midi.ControllerType.BALANCE_LSB))
+    _set_balance = _scaled_controller_handler("_balance", _midi.balance_14bit,
+                                              _midi.ControllerType.BALANCE_MSB,
+                                              _midi.ControllerType.BALANCE_LSB)
 
     @property
     def balance(self) -> float:
         return self._balance
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.PAN_MSB, _midi.ControllerType.PAN_LSB)
-    def _set_pan(self, controller):
-        self._pan = _midi.balance_14bit(self.calculate_msb_lsb(_midi.ControllerType.PAN_MSB,
-                                                               _midi.ControllerType.PAN_LSB))
+    _set_pan = _scaled_controller_handler("_pan", _midi.balance_14bit,
+                                          _midi.ControllerType.PAN_MSB,
+                                          _midi.ControllerType.PAN_LSB)
 
     @property
     def pan(self) -> float:
         return self._pan
 
-    # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.EXPRESSION_MSB, _midi.ControllerType.EXPRESSION_LSB)
-    def _set_expression(self, controller):
-        self._expression = _midi.scale_14bit(self.calculate_msb_lsb(_midi.ControllerType.EXPRESSION_MSB,
-                                                                    _midi.ControllerType.EXPRESSION_LSB))
+    _set_expression = _scaled_controller_handler("_expression", _midi.scale_14bit,
+                                                 _midi.ControllerType.EXPRESSION_MSB,
+                                                 _midi.ControllerType.EXPRESSION_LSB)
 
     @property
     def expression(self) -> float:
         return self._expression
 
     # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.RPN_MSB, _midi.ControllerType.RPN_LSB)
+    @_controller_handler(_midi.ControllerType.RPN_MSB, _midi.ControllerType.RPN_LSB, always_run=True)
     def _set_rpn(self, controller):
         self._in_rpn_data = None if self.get_msb_lsb_values(_midi.ControllerType.RPN_MSB) == MidiChannelInfo.NULL_RPN \
             else True
 
     # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.NRPN_MSB, _midi.ControllerType.NRPN_LSB)
+    @_controller_handler(_midi.ControllerType.NRPN_MSB, _midi.ControllerType.NRPN_LSB, always_run=True)
     def _set_nrpn(self, controller):
         self._in_rpn_data = None if self.get_msb_lsb_values(_midi.ControllerType.NRPN_MSB) == MidiChannelInfo.NULL_RPN \
             else False
 
-    @_controller_handler(_midi.ControllerType.DATA_ENTRY_MSB, _midi.ControllerType.DATA_ENTRY_LSB)
-    def _set_expression(self, controller):
+    @_controller_handler(_midi.ControllerType.DATA_ENTRY_MSB, _midi.ControllerType.DATA_ENTRY_LSB, always_run=True)
+    def _set_data_entry(self, controller):
         # Ignore NRPN data.
         if self._in_rpn_data is None:
             _logging.warning(f"Had {str(controller)} controller outside of RPN or NRPN.")
@@ -419,7 +489,7 @@ class MidiChannelInfo:
                                self._controllers[_midi.ControllerType.DATA_ENTRY_LSB])
 
     # noinspection PyUnusedLocal
-    @_controller_handler(_midi.ControllerType.RESET_ALL_CONTROLLERS)
+    @_controller_handler(_midi.ControllerType.RESET_ALL_CONTROLLERS, always_run=True)
     def _reset_all_controllers(self, controller):
         self.reset_controllers()
 
@@ -428,14 +498,26 @@ class MidiChannelInfo:
             self.rpn[rpn][0] = msb
         if lsb is not None:
             self.rpn[rpn][1] = lsb
-        if rpn == MidiChannelInfo.PITCH_BEND_SENSITIVITY_RPN:
-            # NOTE: The MIDI specs calls the LSB "cents", but 127 = 100 cents
-            semitones, cents = self.rpn[MidiChannelInfo.PITCH_BEND_SENSITIVITY_RPN]
-            self._pitch_bend_sensitivity = semitones + cents / 127.0
-        elif rpn in [MidiChannelInfo.FINE_TUNING_RPN, MidiChannelInfo.COARSE_TUNING_RPN]:
-            fine_tuning = _midi.balance_14bit(calculate_msb_lsb(*self.rpn[MidiChannelInfo.FINE_TUNING_RPN]))
-            coarse_tuning = self.rpn[MidiChannelInfo.COARSE_TUNING_RPN][0] - 64
-            self._tuning = coarse_tuning + fine_tuning
+        updater = MidiChannelInfo._RPN_UPDATERS.get(rpn)
+        if updater is not None:
+            updater(self)
+
+    def _update_pitch_bend_sensitivity(self):
+        # NOTE: The MIDI specs calls the LSB "cents", but 127 = 100 cents
+        semitones, cents = self.rpn[MidiChannelInfo.PITCH_BEND_SENSITIVITY_RPN]
+        self._pitch_bend_sensitivity = semitones + cents / 127.0
+
+    def _update_tuning(self):
+        fine_tuning = _midi.balance_14bit(calculate_msb_lsb(*self.rpn[MidiChannelInfo.FINE_TUNING_RPN]))
+        coarse_tuning = self.rpn[MidiChannelInfo.COARSE_TUNING_RPN][0] - 64
+        self._tuning = coarse_tuning + fine_tuning
+
+    # Recalculates values that depend on an RPN, keyed by RPN.
+    _RPN_UPDATERS = {
+        PITCH_BEND_SENSITIVITY_RPN: _update_pitch_bend_sensitivity,
+        FINE_TUNING_RPN: _update_tuning,
+        COARSE_TUNING_RPN: _update_tuning,
+    }
 
     @property
     def pitch_bend_sensitivity(self) -> float:
@@ -445,28 +527,20 @@ class MidiChannelInfo:
     def scaled_pitch_bend(self) -> float:
         return self.pitch_bend * self._pitch_bend_sensitivity
 
-    def calculate_msb_lsb(self, msb: _midi.ControllerType, lsb: _midi.ControllerType) -> int:
-        assert msb < 32
-        assert 32 <= lsb < 63
-        return calculate_msb_lsb(self._controllers[msb], self._controllers[lsb])
+    def calculate_msb_lsb(self, controller: _midi.ControllerType) -> int:
+        """Returns the 14-bit value of the MSB/LSB controller pair that includes the given controller."""
+        msb, lsb = _MSB_LSB_PAIRS[controller]
+        # Stored values are already masked to 7 bits.
+        return (self._controllers[msb] << 7) | self._controllers[lsb]
 
     def get_msb_lsb_values(self, controller: _midi.ControllerType) -> _typing.Tuple[int, int]:
         """Returns the MSB and LSB values based on the given MSB or LSB controller type as a tuple.
         :except ValueError: when a non-MSB/LSB controller is given
         """
-        if controller in [_midi.ControllerType.RPN_MSB, _midi.ControllerType.NRPN_MSB]:
-            msb = controller
-            lsb = msb - 1
-        elif controller in [_midi.ControllerType.RPN_MSB, _midi.ControllerType.NRPN_MSB]:
-            lsb = controller
-            msb = lsb + 1
-        else:
-            if controller >= 64:
-                raise ValueError("Must be an MSB or LSB controller type.")
-            # PyCharm bug - https://youtrack.jetbrains.com/issue/PY-42287
-            # noinspection PyArgumentList
-            msb = _midi.ControllerType(controller % 32)
-            lsb = msb + 32
+        pair = _MSB_LSB_PAIRS[controller]
+        if pair is None:
+            raise ValueError("Must be an MSB or LSB controller type.")
+        msb, lsb = pair
         return self._controllers[msb], self._controllers[lsb]
 
     def add_active_note(self, note_event: "NoteEvent"):
@@ -474,7 +548,7 @@ class MidiChannelInfo:
         self.active_notes.append(note_event)
         # return _active_note
 
-    def remove_active_note(self, channel: int, note: int, track: int, show_error: bool = True, **_):
+    def remove_active_note(self, channel: int, note: int, track: int, show_error: bool = True):
         _active_note = next(filter(lambda note_event: note_event.note == note and note_event.channel == channel,
                                    self.active_notes), None)
         if _active_note:
@@ -2,6 +2,16 @@ import logging as _logging
 import typing as _typing
 import imfcreator.midi as _midi
 
+# Event types used by the builder helpers, bound at module level so each event skips the enum attribute lookups.
+_NOTE_OFF = _midi.EventType.NOTE_OFF
+_NOTE_ON = _midi.EventType.NOTE_ON
+_POLYPHONIC_KEY_PRESSURE = _midi.EventType.POLYPHONIC_KEY_PRESSURE
+_CONTROLLER_CHANGE = _midi.EventType.CONTROLLER_CHANGE
+_PROGRAM_CHANGE = _midi.EventType.PROGRAM_CHANGE
+_CHANNEL_KEY_PRESSURE = _midi.EventType.CHANNEL_KEY_PRESSURE
+_PITCH_BEND = _midi.EventType.PITCH_BEND
+_META = _midi.EventType.META
+
 
 class SongBuilder:
     """A class to help build event lists for MidiSongFile classes."""
@@ -13,85 +23,110 @@ class SongBuilder:
         :param track: The track number for the generated event list.
         """
         self.track = track
-        self.playback_rate = playback_rate
         self._events = []  # type: _typing.List[_midi.SongEvent]
-        self.current_time = 0
+        self._append_event = self._events.append
+        self._playback_rate = float(playback_rate)
+        self._current_time = 0
+        # The current time divided by the playback rate.  Updated whenever either changes.
+        self._event_time = 0.0
+
+    @property
+    def playback_rate(self) -> float:
+        return self._playback_rate
+
+    @playback_rate.setter
+    def playback_rate(self, value: float):
+        self._playback_rate = float(value)
+        self._event_time = self._current_time / self._playback_rate
+
+    @property
+    def current_time(self) -> int:
+        return self._current_time
+
+    @current_time.setter
+    def current_time(self, value: int):
+        self._current_time = value
+        self._event_time = self._current_time / self._playback_rate
 
     def add_time(self, time: int):
         """Progresses the current time within the track."""
-        self.current_time += time
+        if time:
+            self._current_time += time
+            self._event_time = self._current_time / self._playback_rate
 
     def add_event(self, event_type: _midi.EventType, data: dict = None, channel: int = None):
-        song_event = _midi.SongEvent(len(self._events), self.track, self.current_time / float(self.playback_rate),
-                                     event_type, data, channel)
+        self._add(event_type, channel, data)
+
+    def _add(self, event_type: _midi.EventType, channel: _typing.Optional[int], data: _typing.Optional[dict]):
+        """Adds an event at the current time."""
+        song_event = _midi.SongEvent(len(self._events), self.track, self._event_time, event_type, data, channel)
         _logging.debug(song_event)
-        self._events.append(song_event)
+        self._append_event(song_event)
 
     @property
     def events(self) -> _typing.List[_midi.SongEvent]:
         return self._events
 
     def note_off(self, channel: int, note: int, velocity: int):
-        self.add_event(_midi.EventType.NOTE_OFF, {"note": note, "velocity": velocity}, channel)
+        self._add(_NOTE_OFF, channel, {"note": note, "velocity": velocity})
 
     def note_on(self, channel: int, note: int, velocity: int):
-        self.add_event(_midi.EventType.NOTE_ON, {"note": note, "velocity": velocity}, channel)
+        self._add(_NOTE_ON, channel, {"note": note, "velocity": velocity})
 
     def change_polyphonic_key_pressure(self, channel: int, note: int, pressure: int):
-        self.add_event(_midi.EventType.POLYPHONIC_KEY_PRESSURE, {"note": note, "pressure": pressure}, channel)
+        self._add(_POLYPHONIC_KEY_PRESSURE, channel, {"note": note, "pressure": pressure})
 
     def change_controller(self, channel: int, controller: _midi.ControllerType, value: int):
-        self.add_event(_midi.EventType.CONTROLLER_CHANGE, {"controller": controller, "value": value}, channel)
+        self._add(_CONTROLLER_CHANGE, channel, {"controller": controller, "value": value})
+
+    def _change_controller_pair(self, channel: int, msb_controller: _midi.ControllerType, msb: int,
+                                lsb_controller: _midi.ControllerType, lsb: _typing.Optional[int]):
+        """Adds the MSB controller change and, when given, the LSB controller change at the current time."""
+        self._add(_CONTROLLER_CHANGE, channel, {"controller": msb_controller, "value": msb})
+        if lsb is not None:
+            self._add(_CONTROLLER_CHANGE, channel, {"controller": lsb_controller, "value": lsb})
 
     # Shortcuts for commonly used controllers.
     def select_bank(self, channel: int, msb: int, lsb: int = None):
-        self.change_controller(channel, _midi.ControllerType.BANK_SELECT_MSB, msb)
-        if lsb is not None:
-            self.change_controller(channel, _midi.ControllerType.BANK_SELECT_LSB, lsb)
+        self._change_controller_pair(channel, _midi.ControllerType.BANK_SELECT_MSB, msb,
+                                     _midi.ControllerType.BANK_SELECT_LSB, lsb)
 
     def set_modulation_wheel(self, channel: int, msb: int, lsb: int = None):
-        self.change_controller(channel, _midi.ControllerType.MODULATION_WHEEL_MSB, msb)
-        if lsb is not None:
-            self.change_controller(channel, _midi.ControllerType.MODULATION_WHEEL_LSB, lsb)
+        self._change_controller_pair(channel, _midi.ControllerType.MODULATION_WHEEL_MSB, msb,
+                                     _midi.ControllerType.MODULATION_WHEEL_LSB, lsb)
 
     def set_volume(self, channel: int, msb: int, lsb: int = None):
-        self.change_controller(channel, _midi.ControllerType.VOLUME_MSB, msb)
-        if lsb is not None:
-            self.change_controller(channel, _midi.ControllerType.VOLUME_LSB, lsb)
+        self._change_controller_pair(channel, _midi.ControllerType.VOLUME_MSB, msb,
+                                     _midi.ControllerType.VOLUME_LSB, lsb)
 
     def set_pan(self, channel: int, msb: int, lsb: int = None):
-        self.change_controller(channel, _midi.ControllerType.PAN_MSB, msb)
-        if lsb is not None:
-            self.change_controller(channel, _midi.ControllerType.PAN_LSB, lsb)
+        self._change_controller_pair(channel, _midi.ControllerType.PAN_MSB, msb,
+                                     _midi.ControllerType.PAN_LSB, lsb)
 
     def set_expression(self, channel: int, msb: int, lsb: int = None):
-        self.change_controller(channel, _midi.ControllerType.EXPRESSION_MSB, msb)
-        if lsb is not None:
-            self.change_controller(channel, _midi.ControllerType.EXPRESSION_MSB, lsb)
+        self._change_controller_pair(channel, _midi.ControllerType.EXPRESSION_MSB, msb,
+                                     _midi.ControllerType.EXPRESSION_LSB, lsb)
 
     def set_instrument(self, channel: int, program: int):
-        self.add_event(_midi.EventType.PROGRAM_CHANGE, {"program": program}, channel)
+        self._add(_PROGRAM_CHANGE, channel, {"program": program})
 
     def set_channel_key_pressure(self, channel: int, pressure: int):
-        self.add_event(_midi.EventType.CHANNEL_KEY_PRESSURE, {"pressure": pressure}, channel)
+        self._add(_CHANNEL_KEY_PRESSURE, channel, {"pressure": pressure})
 
     def pitch_bend(self, channel: int, amount: float):
-        self.add_event(_midi.EventType.PITCH_BEND, {"amount": amount}, channel)
+        self._add(_PITCH_BEND, channel, {"amount": amount})
 
     def add_sysex_data(self, event_type: _midi.EventType, data: bytes):
-        self.add_event(event_type, {"data": data})
+        self._add(event_type, None, {"data": data})
 
     def add_meta_sequence_number(self, number: int):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.SEQUENCE_NUMBER, "number": number})
+        self._add(_META, None, {"meta_type": _midi.MetaType.SEQUENCE_NUMBER, "number": number})
 
     def add_meta_event(self, meta_type: _midi.MetaType, data: dict):
-        temp_data = {"meta_type": meta_type}
-        if data:
-            temp_data.update(data)
-        self.add_event(_midi.EventType.META, temp_data)
+        self._add(_META, None, {"meta_type": meta_type, **data} if data else {"meta_type": meta_type})
 
     def add_meta_text_event(self, meta_type: _midi.MetaType, text: str):
-        self.add_meta_event(meta_type, {"text": text})
+        self._add(_META, None, {"meta_type": meta_type, "text": text})
 
     def add_copyright(self, text: str):
         self.add_meta_text_event(_midi.MetaType.COPYRIGHT, text)
@@ -118,19 +153,19 @@ class SongBuilder:
         self.add_meta_text_event(_midi.MetaType.DEVICE_NAME, text)
 
     def add_meta_channel_prefix(self, channel: int):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.CHANNEL_PREFIX, "channel": channel})
+        self._add(_META, None, {"meta_type": _midi.MetaType.CHANNEL_PREFIX, "channel": channel})
 
     def add_meta_port(self, port: int):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.PORT, "port": port})
+        self._add(_META, None, {"meta_type": _midi.MetaType.PORT, "port": port})
 
     def add_end_of_track(self):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.END_OF_TRACK})
+        self._add(_META, None, {"meta_type": _midi.MetaType.END_OF_TRACK})
 
     def set_tempo(self, bpm: float):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.SET_TEMPO, "bpm": bpm})
+        self._add(_META, None, {"meta_type": _midi.MetaType.SET_TEMPO, "bpm": bpm})
 
     def add_meta_smpte_offset(self, hours: int, minutes: int, seconds: int, frames: int, fractional_frames: int):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.SMPTE_OFFSET,
+        self._add(_META, None, {"meta_type": _midi.MetaType.SMPTE_OFFSET,
                                               "hours": hours,
                                               "minutes": minutes,
                                               "seconds": seconds,
@@ -140,7 +175,7 @@ class SongBuilder:
 
     def set_time_signature(self, numerator: int, denominator: int, midi_clocks_per_metronome_tick: int = None,
                            number_of_32nd_notes_per_beat: int = None):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.TIME_SIGNATURE,
+        self._add(_META, None, {"meta_type": _midi.MetaType.TIME_SIGNATURE,
                                               "numerator": numerator,
                                               "denominator": denominator,
                                               "midi_clocks_per_metronome_tick": midi_clocks_per_metronome_tick,
@@ -148,10 +183,10 @@ class SongBuilder:
                                               })
 
     def set_key_signature(self, sharps_flats: int, major_minor: int):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.KEY_SIGNATURE,
+        self._add(_META, None, {"meta_type": _midi.MetaType.KEY_SIGNATURE,
                                               "sharps_flats": sharps_flats,
                                               "major_minor": major_minor,
                                               })
 
     def add_sequencer_specific_data(self, data: bytes):
-        self.add_event(_midi.EventType.META, {"meta_type": _midi.MetaType.SEQUENCER_SPECIFIC, "data": data})
+        self._add(_META, None, {"meta_type": _midi.MetaType.SEQUENCER_SPECIFIC, "data": data})
@@ -26,6 +26,7 @@ class ImfSong(AdlibSongFile):
     """
     _MAXIMUM_COMMAND_COUNT = 65535 // 4
     _TAG_BYTE = b"\x1a"
+    _COMMAND_STRUCT = _struct.Struct("<BBH")  # reg, value, delay
     _DEFAULT_TICKS = {
         "imf0": 560,
         "imf0dn2": 280,
@@ -133,23 +134,24 @@ COMMANDS:
             fp.write(_struct.pack("<H", command_count * 4))
         # command_count = ImfSong._MAXIMUM_COMMAND_COUNT
         _logging.info(f"Writing {command_count} commands.")
-        for command in self._commands[0:command_count]:
-            fp.write(_struct.pack("<BBH", *command))
+        # Pack all of the commands into one buffer and write it at once.
+        command_size = ImfSong._COMMAND_STRUCT.size
+        pack_into = ImfSong._COMMAND_STRUCT.pack_into
+        data = bytearray(command_count * command_size)
+        for offset, command in zip(range(0, len(data), command_size), self._commands):
+            pack_into(data, offset, *command)
+        fp.write(data)
         # Add unofficial tag for type 1 files.
         if self._filetype == "imf1" and (self.title or self.composer or self.remarks or self.program):
-            fp.write(ImfSong._TAG_BYTE)
-            if self.title:
-                fp.write(bytearray(self.title, "ascii")[0:255])
-            fp.write(b"\x00")
-            if self.composer:
-                fp.write(bytearray(self.composer, "ascii")[0:255])
-            fp.write(b"\x00")
-            if self.remarks:
-                fp.write(bytearray(self.remarks, "ascii")[0:255])
-            fp.write(b"\x00")
+            tag = bytearray(ImfSong._TAG_BYTE)
+            for text in (self.title, self.composer, self.remarks):
+                if text:
+                    tag += text.encode("ascii")[0:255]
+                tag += b"\x00"
             # Padded to 8 bytes + 1 null terminator.
-            fp.write((bytearray(self.program if self.program else "", "ascii") + b"\x00" * 8)[0:8])
-            fp.write(b"\x00")
+            program = self.program.encode("ascii")[0:8] if self.program else b""
+            tag += program.ljust(8, b"\x00") + b"\x00"
+            fp.write(tag)
 
     @classmethod
     def _convert_from(cls, midi_song: MidiSongFile, filetype: str, **settings) -> "ImfSong":
@@ -189,11 +191,11 @@ COMMANDS:
             assert ticks >= last_command_ticks
             if ticks == last_command_ticks:
                 return
-            # PyCharm has an incorrect warning here.
-            # noinspection PyTypeChecker
-            song._commands[command_index] = song._commands[command_index][:2] + (ticks - last_command_ticks,)
-            # _logging.debug(f"Delay: {song._commands[command_index][2]}")
-            assert 0 <= song._commands[command_index][2] <= 0xffff, \
+            delay = ticks - last_command_ticks
+            reg, value, _ = song._commands[command_index]
+            song._commands[command_index] = (reg, value, delay)
+            # _logging.debug(f"Delay: {delay}")
+            assert 0 <= delay <= 0xffff, \
                 f"{time}, {tempo_start_time}, {ticks_per_beat}, {ticks}, {last_command_ticks}"
             last_command_ticks = ticks
 
@@ -256,7 +258,18 @@ COMMANDS:
         def find_imf_channel_for_instrument_note(note_event: _midiengine.NoteEvent):
             return next(filter(lambda ch: ch.is_active and ch.last_note.matches_note(note_event), imf_channels), None)
 
+        # Bent notes repeat often during a song, so cache the calculated block and f-num for each note and bend.
+        block_freq_cache = {}  # type: _typing.Dict[_typing.Tuple[int, float], _typing.Tuple[int, int]]
+
         def get_block_and_freq(note: int, scaled_pitch_bend: float):
+            key = (note, scaled_pitch_bend)
+            try:
+                return block_freq_cache[key]
+            except KeyError:
+                block_freq_cache[key] = block_freq = calculate_block_and_freq(note, scaled_pitch_bend)
+                return block_freq
+
+        def calculate_block_and_freq(note: int, scaled_pitch_bend: float):
             assert note < 128
             while note >= len(BLOCK_FREQ_NOTE_MAP):
                 note -= 12
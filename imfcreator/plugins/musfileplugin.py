@@ -51,6 +51,7 @@ def _u8(f):
 class MusFile(MidiSongFile):
     """Reads a MIDI file."""
 
+    _MAGIC4 = _SIGNATURE
     PERCUSSION_CHANNEL = 15
 
     def __init__(self, fp=None, filename=None):
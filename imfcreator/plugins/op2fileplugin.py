@@ -10,6 +10,7 @@ class Op2FilePlugin(InstrumentFile):
     """Read instruments from a DMX Sound Library file."""
     DESCRIPTION = "DMX Sound Library"
     _FILE_SIGNATURE = b"#OPL_II#"
+    _MAGIC4 = _FILE_SIGNATURE[0:4]
     _FILE_SIZE = 11908
     _ENTRY_START = 8
     _ENTRY_SIZE = 36
@@ -1,18 +1,21 @@
 import logging as _logging
 import typing as _typing
 import imfcreator.adlib as _adlib
-from collections import namedtuple
 from . import FileTypeInfo, plugin, InstrumentFile, InstrumentId, InstrumentType
 from ._binary import u8, u16le, u16be, s16be, get_unicode_text
 from ._midiengine import calculate_msb_lsb
 
 
-_BANK_ENTRY = namedtuple("_BANK_ENTRY", ["name", "lsb", "msb"])
+class _BankEntry(_typing.NamedTuple):
+    name: str
+    lsb: int
+    msb: int
 
 
 @plugin
 class WoplFilePlugin(InstrumentFile):
     _FILE_SIGNATURE = b"WOPL3-BANK\0"
+    _MAGIC4 = _FILE_SIGNATURE[0:4]
     # Flags
     _FLAG_2OP_MODE = 0x00
     _FLAG_4OP_MODE = 0x01
@@ -105,14 +108,14 @@ class WoplFilePlugin(InstrumentFile):
         program = index % 128
         return InstrumentId(inst_type, bank, program), instrument
 
-    def _get_bank_entry(self, index) -> _typing.Optional[_BANK_ENTRY]:
+    def _get_bank_entry(self, index) -> _typing.Optional[_BankEntry]:
         if self._version >= 2:
             bank = index // 128
             self.fp.seek(self._bank_meta_entry_start + (bank * self._bank_meta_entry_size))
             name = get_unicode_text(self.fp.read(32))  # type: str
             lsb = u8(self.fp.read(1))
             msb = u8(self.fp.read(1))
-            return _BANK_ENTRY(name, lsb, msb)
+            return _BankEntry(name, lsb, msb)
         return None
 
     @staticmethod
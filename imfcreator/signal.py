@@ -11,7 +11,12 @@ class Signal:
     def __init__(self, **args):
         self._args = args
         self._arg_names = set(args.keys())
+        self._arg_order = tuple(args.keys())
         self._listeners = []
+        # Listeners split by how emit_positional calls them.  Listeners whose arguments are not in the declared order
+        # must be called with keywords.
+        self._positional_listeners = []
+        self._keyword_listeners = []
 
     def _args_string(self):
         if len(self._arg_names) == 0:
@@ -25,9 +30,17 @@ class Signal:
         if set(n for n in args) != self._arg_names:
             raise ValueError(f"Listener must have these arguments: {self._args_string()}")
         self._listeners.append(listener)
+        if tuple(args) == self._arg_order:
+            self._positional_listeners.append(listener)
+        else:
+            self._keyword_listeners.append(listener)
 
     def remove_handler(self, listener):
         self._listeners.remove(listener)
+        if listener in self._positional_listeners:
+            self._positional_listeners.remove(listener)
+        else:
+            self._keyword_listeners.remove(listener)
 
     def trigger(self, *args, **kwargs):
         if args or set(kwargs.keys()) != self._arg_names:
@@ -35,5 +48,25 @@ class Signal:
         for listener in self._listeners:
             listener(**kwargs)
 
+    def emit_positional(self, *args):
+        """Triggers the signal with arguments given in the order they were declared in the constructor.
+
+        This avoids building a keyword dictionary for each call.  Listeners whose arguments are in the declared order
+        are called first, followed by the listeners that must be called with keywords.
+        """
+        if len(args) != len(self._arg_order):
+            raise ValueError(f"Signal trigger must have these arguments: {self._args_string()}")
+        for listener in self._positional_listeners:
+            listener(*args)
+        if self._keyword_listeners:
+            kwargs = dict(zip(self._arg_order, args))
+            for listener in self._keyword_listeners:
+                listener(**kwargs)
+
+    @property
+    def has_handlers(self) -> bool:
+        """Returns whether the signal has any listeners."""
+        return bool(self._listeners)
+
     def __call__(self, *args, **kwargs):
         self.trigger(*args, **kwargs)
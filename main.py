@@ -2,7 +2,7 @@
 
 import imfcreator.instruments as instruments
 from imfcreator.mainapplication import MainApplication
-from imfcreator.plugins import MidiSongFile, AdlibSongFile, load_plugins
+from imfcreator.plugins import MidiSongFile, AdlibSongFile
 
 
 def open_ui(song):
@@ -31,7 +31,6 @@ def open_ui(song):
 
 
 def main():
-    load_plugins()
     # if not os.path.isfile("GENMIDI.OP2"):
     #     shutil.copy("genmidi/GENMIDI.OP2", "GENMIDI.OP2")
 
@@ -63,8 +63,7 @@ def main():
     imfcreator.logging.getLogger().setLevel(args.verbose * 10)
     # These can be imported now that the logger level has been set.
     import imfcreator.instruments as instruments
-    from imfcreator.plugins import AdlibSongFile, MidiSongFile, load_plugins
-    load_plugins()
+    from imfcreator.plugins import AdlibSongFile, MidiSongFile
     # noinspection PyTypeChecker
     parser = argparse.ArgumentParser(description="A tool to convert MIDI music files to IMF files.",
                                      formatter_class=HelpFormatter, parents=[logging_parser])
@@ -2,13 +2,20 @@ import inspect
 import io
 import logging
 import os
+import struct
+import tempfile
 import unittest
 
 try:
     # Only show errors when importing here.
     logging.basicConfig(level=logging.ERROR, format='%(levelname)s\t%(message)s')
+    import imfcreator.midi
     import imfcreator.plugins
+    import imfcreator.plugins._binary
+    import imfcreator.plugins._midiengine
+    import imfcreator.plugins._songbuilder
     import imfcreator.instruments
+    import imfcreator.signal
 except ImportError:
     raise
 
@@ -124,6 +131,260 @@ class InstrumentTestCase(LoggingTestCase):
         self.validate_log_results(filename)
 
 
+class BinaryTestCase(unittest.TestCase):
+    def test_read_integers(self):
+        binary = imfcreator.plugins._binary
+        self.assertEqual(binary.u8(b"\xff"), 0xff)
+        self.assertEqual(binary.s8(b"\xff"), -1)
+        self.assertEqual(binary.u16le(b"\x34\x12"), 0x1234)
+        self.assertEqual(binary.u16be(b"\x12\x34"), 0x1234)
+        self.assertEqual(binary.s16le(b"\xfe\xff"), -2)
+        self.assertEqual(binary.s16be(b"\xff\xfe"), -2)
+        self.assertEqual(binary.u32le(b"\x78\x56\x34\x12"), 0x12345678)
+        self.assertEqual(binary.u32be(b"\x12\x34\x56\x78"), 0x12345678)
+        self.assertEqual(binary.s32le(b"\xfe\xff\xff\xff"), -2)
+        self.assertEqual(binary.s32be(b"\xff\xff\xff\xfe"), -2)
+
+    def test_read_short_data(self):
+        binary = imfcreator.plugins._binary
+        # Short reads at the end of a file must fail rather than decode to a wrong value.
+        for function, size in [(binary.u8, 1), (binary.s8, 1),
+                               (binary.u16le, 2), (binary.u16be, 2), (binary.s16le, 2), (binary.s16be, 2),
+                               (binary.u32le, 4), (binary.u32be, 4), (binary.s32le, 4), (binary.s32be, 4)]:
+            for length in range(size):
+                with self.subTest(function=function.__name__, length=length):
+                    with self.assertRaises(ValueError):
+                        function(b"\x01" * length)
+
+    def test_read_midi_var_length_buf(self):
+        read_midi_var_length_buf = imfcreator.plugins._binary.read_midi_var_length_buf
+        for data, value in [(b"\x00", 0),
+                            (b"\x7f", 0x7f),
+                            (b"\x81\x00", 0x80),
+                            (b"\xff\x7f", 0x3fff),
+                            (b"\x81\x80\x00", 0x4000),
+                            (b"\xff\xff\x7f", 0x1fffff),
+                            (b"\x81\x80\x80\x00", 0x200000),
+                            (b"\xff\xff\xff\x7f", 0xfffffff)]:
+            with self.subTest(data=data):
+                # The value is read from the given position and the position following it is returned.
+                self.assertEqual(read_midi_var_length_buf(b"\xaa" + data + b"\xbb", 1), (value, len(data) + 1))
+        with self.assertRaises(IndexError):
+            read_midi_var_length_buf(b"\x81\x80", 0)
+
+    def test_get_unicode_text(self):
+        get_unicode_text = imfcreator.plugins._binary.get_unicode_text
+        # Only trailing nulls are removed.  Trailing 'x' characters are part of the text.
+        self.assertEqual(get_unicode_text(b"Music Box\x00\x00\x00"), "Music Box")
+        self.assertEqual(get_unicode_text(b"Alto Sax"), "Alto Sax")
+        self.assertEqual(get_unicode_text(b"Name\x00old\x00\x00"), "Name\x00old")
+        self.assertEqual(get_unicode_text(b"\xe9t\xe9\x00"), "\xe9t\xe9")
+        # Backslash escapes are decoded, including escaped trailing nulls.
+        self.assertEqual(get_unicode_text(b"Caf\\xe9\x00"), "Caf\xe9")
+        self.assertEqual(get_unicode_text(b"Tab\\tEnd\\x00"), "Tab\tEnd")
+
+
+class MidiChannelInfoTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.channel = imfcreator.plugins._midiengine.MidiChannelInfo(0, imfcreator.plugins.MidiSongFile)
+
+    def test_get_msb_lsb_values(self):
+        controller_type = imfcreator.midi.ControllerType
+        self.channel.set_controller_value(controller_type.VOLUME_MSB, 100)
+        self.channel.set_controller_value(controller_type.VOLUME_LSB, 42)
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.VOLUME_MSB), (100, 42))
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.VOLUME_LSB), (100, 42))
+        # RPN and NRPN have their LSB before the MSB.
+        self.channel.set_controller_value(controller_type.RPN_MSB, 0)
+        self.channel.set_controller_value(controller_type.RPN_LSB, 2)
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.RPN_MSB), (0, 2))
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.RPN_LSB), (0, 2))
+        with self.assertRaises(ValueError):
+            self.channel.get_msb_lsb_values(controller_type.SUSTAIN_PEDAL_SWITCH)
+
+    def _record_handler_calls(self, controller) -> list:
+        """Wraps the handler for the given controller and returns the list of controllers it is called for."""
+        handlers = imfcreator.plugins._midiengine._CONTROLLER_HANDLERS
+        original = handlers[controller]
+        calls = []
+
+        def _handler(channel, cc):
+            calls.append(cc)
+            original(channel, cc)
+
+        handlers[controller] = _handler
+        self.addCleanup(handlers.__setitem__, controller, original)
+        return calls
+
+    def test_unchanged_value_skips_handler(self):
+        controller_type = imfcreator.midi.ControllerType
+        calls = self._record_handler_calls(controller_type.VOLUME_MSB)
+        self.channel.set_controller_value(controller_type.VOLUME_MSB, 100)
+        self.channel.set_controller_value(controller_type.VOLUME_MSB, 100)
+        self.assertEqual(len(calls), 1)
+        self.channel.set_controller_value(controller_type.VOLUME_MSB, 90)
+        self.assertEqual(len(calls), 2)
+
+    def test_always_run_handlers(self):
+        controller_type = imfcreator.midi.ControllerType
+        for controller in [controller_type.RPN_MSB, controller_type.RPN_LSB, controller_type.NRPN_MSB,
+                           controller_type.NRPN_LSB, controller_type.DATA_ENTRY_MSB, controller_type.DATA_ENTRY_LSB,
+                           controller_type.RESET_ALL_CONTROLLERS]:
+            with self.subTest(controller=controller):
+                calls = self._record_handler_calls(controller)
+                self.channel.set_controller_value(controller, 0)
+                self.channel.set_controller_value(controller, 0)
+                self.assertEqual(len(calls), 2)
+        # Repeated data entry applies to the selected RPN each time.
+        self.channel.set_controller_value(controller_type.RPN_MSB, 0)
+        self.channel.set_controller_value(controller_type.RPN_LSB, 0)
+        self.channel.set_controller_value(controller_type.DATA_ENTRY_MSB, 12)
+        self.channel.rpn[imfcreator.plugins._midiengine.MidiChannelInfo.PITCH_BEND_SENSITIVITY_RPN][0] = 0
+        self.channel.set_controller_value(controller_type.DATA_ENTRY_MSB, 12)
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.DATA_ENTRY_MSB)[0], 12)
+        self.assertEqual(
+            self.channel.rpn[imfcreator.plugins._midiengine.MidiChannelInfo.PITCH_BEND_SENSITIVITY_RPN][0], 12)
+
+    def test_reset_controllers(self):
+        controller_type = imfcreator.midi.ControllerType
+        for controller, value in [(controller_type.BANK_SELECT_MSB, 120),  # GM drum bank
+                                  (controller_type.MODULATION_WHEEL_MSB, 50),
+                                  (controller_type.VOLUME_MSB, 10),
+                                  (controller_type.BALANCE_MSB, 0),
+                                  (controller_type.PAN_MSB, 0),
+                                  (controller_type.EXPRESSION_MSB, 20),
+                                  (controller_type.RPN_MSB, 0),
+                                  (controller_type.RPN_LSB, 0),
+                                  (controller_type.DATA_ENTRY_MSB, 12)]:
+            self.channel.set_controller_value(controller, value)
+        self.assertTrue(self.channel._is_drum_bank)
+        self.assertEqual(self.channel.pitch_bend_sensitivity, 12.0)
+        self.channel.reset_controllers()
+        self.assertEqual(self.channel.bank, 0)
+        self.assertFalse(self.channel._is_drum_bank)
+        self.assertEqual(self.channel.modulation_wheel, 0.0)
+        # 127 << 7 scaled over the 14-bit range.
+        self.assertAlmostEqual(self.channel.volume, 16256 / 16383)
+        self.assertAlmostEqual(self.channel.expression, 16256 / 16383)
+        self.assertEqual(self.channel.balance, 0.0)
+        self.assertEqual(self.channel.pan, 0.0)
+        # Both RPN and NRPN select the null RPN.
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.RPN_MSB), (127, 127))
+        self.assertEqual(self.channel.get_msb_lsb_values(controller_type.NRPN_MSB), (127, 127))
+        self.assertIsNone(self.channel._in_rpn_data)
+        # MidiSongFile.DEFAULT_PITCH_BEND_SCALE
+        self.assertEqual(self.channel.pitch_bend_sensitivity, 2.0)
+
+
+class SongBuilderTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.builder = imfcreator.plugins._songbuilder.SongBuilder(1.0)
+
+    def test_set_expression(self):
+        self.builder.set_expression(3, 100, 42)
+        self.assertEqual([(event.type, event.channel, event.data["controller"], event.data["value"])
+                          for event in self.builder.events], [
+            (imfcreator.midi.EventType.CONTROLLER_CHANGE, 3, imfcreator.midi.ControllerType.EXPRESSION_MSB, 100),
+            (imfcreator.midi.EventType.CONTROLLER_CHANGE, 3, imfcreator.midi.ControllerType.EXPRESSION_LSB, 42),
+        ])
+        self.assertEqual([event.index for event in self.builder.events], [0, 1])
+
+
+class SongEventTestCase(unittest.TestCase):
+    def test_sort_key(self):
+        event_type = imfcreator.midi.EventType
+        builder = imfcreator.plugins._songbuilder.SongBuilder(1.0, track=1)
+        builder.note_on(2, 60, 100)
+        builder.set_tempo(120.0)
+        builder.note_off(1, 60, 0)
+        builder.add_time(1)
+        builder.note_on(0, 62, 100)
+        builder.change_controller(0, imfcreator.midi.ControllerType.VOLUME_MSB, 100)
+        events = list(reversed(builder.events))
+        events.append(imfcreator.midi.SongEvent(0, 0, 1.0, event_type.NOTE_ON, {"note": 64, "velocity": 100}, 0))
+        expected = sorted(events, key=imfcreator.midi.SongEvent.sort_key)
+        self.assertEqual([(event.track, event.index) for event in sorted(events)],
+                         [(event.track, event.index) for event in expected])
+        self.assertEqual([(event.time, event.type, event.channel, event.track) for event in expected], [
+            (0.0, event_type.META, None, 1),
+            (0.0, event_type.NOTE_OFF, 1, 1),
+            (0.0, event_type.NOTE_ON, 2, 1),
+            (1.0, event_type.CONTROLLER_CHANGE, 0, 1),
+            (1.0, event_type.NOTE_ON, 0, 0),
+            (1.0, event_type.NOTE_ON, 0, 1),
+        ])
+
+
+class TruncatedMidiTestCase(unittest.TestCase):
+    _HEADER = b"MThd\x00\x00\x00\x06\x00\x00\x00\x01\x00\x60"
+
+    def _load(self, track_data: bytes, chunk_length: int = None):
+        if chunk_length is None:
+            chunk_length = len(track_data)
+        fp = io.BytesIO(self._HEADER + b"MTrk" + chunk_length.to_bytes(4, "big") + track_data)
+        fp.name = "truncated.mid"
+        with self.assertLogs(level=logging.ERROR):
+            with self.assertRaises(ValueError):
+                imfcreator.plugins.MidiSongFile.load_file(fp)
+
+    def test_truncated_event(self):
+        # Note on without its velocity.
+        self._load(b"\x00\x90\x3c")
+
+    def test_truncated_delta_time(self):
+        self._load(b"\x00\x90\x3c\x40\x81")
+
+    def test_truncated_meta_data(self):
+        # Text meta event longer than the track.
+        self._load(b"\x00\xff\x01\x10text")
+
+    def test_truncated_chunk(self):
+        # The file ends after a complete note on event but the chunk length promises more.
+        track_data = b"\x00\x90\x3c\x40"
+        self._load(track_data, len(track_data) + 4)
+
+
+class SignalTestCase(unittest.TestCase):
+    def test_emit_positional(self):
+        signal = imfcreator.signal.Signal(time=float, channel=int)
+        calls = []
+
+        def positional_listener(time, channel):
+            calls.append(("positional", time, channel))
+
+        def keyword_listener(channel, time):
+            calls.append(("keyword", time, channel))
+
+        signal.add_handler(keyword_listener)
+        signal.add_handler(positional_listener)
+        signal.emit_positional(1.5, 3)
+        self.assertEqual(sorted(calls), [("keyword", 1.5, 3), ("positional", 1.5, 3)])
+        calls.clear()
+        signal.remove_handler(positional_listener)
+        signal.emit_positional(2.0, 4)
+        self.assertEqual(calls, [("keyword", 2.0, 4)])
+        calls.clear()
+        signal.remove_handler(keyword_listener)
+        signal.emit_positional(2.0, 4)
+        self.assertEqual(calls, [])
+        with self.assertRaises(ValueError):
+            signal.emit_positional(1.0)
+
+    def test_has_handlers(self):
+        signal = imfcreator.signal.Signal(state=int)
+
+        def listener(state):
+            pass
+
+        self.assertFalse(signal.has_handlers)
+        # Signals are always truthy, with or without listeners.
+        self.assertTrue(signal)
+        signal.add_handler(listener)
+        self.assertTrue(signal.has_handlers)
+        signal.remove_handler(listener)
+        self.assertFalse(signal.has_handlers)
+
+
 class SongLoadTestCase(LoggingTestCase):
     def __init__(self, method_name, filename):
         super().__init__(methodName=method_name)
@@ -160,6 +421,57 @@ class ConvertTestCase(LoggingTestCase):
             self.validate_log_results(self.filename)
 
 
+class ImfSaveTestCase(unittest.TestCase):
+    _FILENAME = os.path.join(_FILES_FOLDER, "AC.mid")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        if not imfcreator.instruments.count():
+            imfcreator.instruments.add_file(os.path.join(_FILES_FOLDER, "Apogee-IMF-90.wopl"))
+        cls.song = imfcreator.plugins.MidiSongFile.load_file(cls._FILENAME)
+
+    def _save(self, filetype: str, **settings) -> (imfcreator.plugins.AdlibSongFile, bytes):
+        imf_song = imfcreator.plugins.AdlibSongFile.convert_from(self.song, filetype, **settings)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "song")
+            imf_song.save_file(filename)
+            with open(filename + imfcreator.plugins.AdlibSongFile.get_default_extension(filetype), "rb") as fp:
+                return imf_song, fp.read()
+
+    def _check_golden_file(self, filetype: str, data: bytes):
+        """Compares saved data against a golden file that was written before the save path was optimized."""
+        golden_file = self._FILENAME + f".{filetype}{imfcreator.plugins.AdlibSongFile.get_default_extension(filetype)}"
+        with open(golden_file, "rb") as fp:
+            self.assertEqual(data, fp.read(), f"File: {os.path.basename(golden_file)}")
+
+    def test_save_imf0(self):
+        imf_song, data = self._save("imf0")
+        self.assertEqual(len(data), imf_song.command_count * 4)
+        self.assertEqual(struct.unpack_from("<BBH", data, 0), (0, 0, 0))
+        self._check_golden_file("imf0", data)
+
+    def test_save_imf1(self):
+        imf_song, data = self._save("imf1")
+        # Type 1 starts with the data length and has no tag without meta data.
+        data_length = struct.unpack_from("<H", data, 0)[0]
+        self.assertEqual(data_length, imf_song.command_count * 4)
+        self.assertEqual(len(data), 2 + data_length)
+        self.assertEqual([struct.unpack_from("<BBH", data, offset) for offset in range(2, len(data), 4)],
+                         imf_song._commands)
+
+    def test_save_imf1_tags(self):
+        imf_song, data = self._save("imf1", title="Title", composer="Composer", remarks="Remarks",
+                                    program="imfcreator")
+        tag = data[2 + struct.unpack_from("<H", data, 0)[0]:]
+        # Signature byte, then null-terminated title, composer, and remarks and a program name padded to 8 bytes.
+        self.assertEqual(tag, b"\x1aTitle\x00Composer\x00Remarks\x00imfcreat\x00")
+        self._check_golden_file("imf1", data)
+        # Short program names are padded with nulls.  Missing text is written as empty strings.
+        _, data = self._save("imf1", program="imfc")
+        tag = data[2 + struct.unpack_from("<H", data, 0)[0]:]
+        self.assertEqual(tag, b"\x1a\x00\x00\x00imfc\x00\x00\x00\x00\x00")
+
+
 def get_test_files(path: str, extension: str):
     """Extension should include the period and is case insensitive."""
     extension = extension.lower()
@@ -177,6 +489,22 @@ def get_tests():
         PluginTestCase("test_check_for_imf1_filetype"),
         InstrumentTestCase("test_load_op2"),
         InstrumentTestCase("test_load_wopl"),
+        BinaryTestCase("test_read_integers"),
+        BinaryTestCase("test_read_short_data"),
+        BinaryTestCase("test_read_midi_var_length_buf"),
+        BinaryTestCase("test_get_unicode_text"),
+        MidiChannelInfoTestCase("test_get_msb_lsb_values"),
+        MidiChannelInfoTestCase("test_unchanged_value_skips_handler"),
+        MidiChannelInfoTestCase("test_always_run_handlers"),
+        MidiChannelInfoTestCase("test_reset_controllers"),
+        SongBuilderTestCase("test_set_expression"),
+        SignalTestCase("test_emit_positional"),
+        SignalTestCase("test_has_handlers"),
+        SongEventTestCase("test_sort_key"),
+        TruncatedMidiTestCase("test_truncated_event"),
+        TruncatedMidiTestCase("test_truncated_delta_time"),
+        TruncatedMidiTestCase("test_truncated_meta_data"),
+        TruncatedMidiTestCase("test_truncated_chunk"),
     ])
     # for filename in get_test_files(_FILES_FOLDER, ".mid"):
     for f in _MIDI_FILES:
@@ -184,6 +512,9 @@ def get_tests():
         suite.addTest(SongLoadTestCase("test_load_file", filename))
         # suite.addTest(ConvertTestCase("test_check_song", filename))
         suite.addTest(ConvertTestCase("test_convert_to_imf", filename))
+    suite.addTest(ImfSaveTestCase("test_save_imf0"))
+    suite.addTest(ImfSaveTestCase("test_save_imf1"))
+    suite.addTest(ImfSaveTestCase("test_save_imf1_tags"))
     return suite
 
 